@@ -0,0 +1,141 @@
+"""
+Batch solver headless: semua puzzle *.csv di satu folder x daftar algoritma,
+dijalankan paralel (satu proses per task, maksimal --workers sekaligus)
+dengan timeout per task. Hasil ditulis (stream) sebagai JSONL atau CSV
+begitu tiap task selesai.
+
+    python rushhour_batch.py dataaset --algorithms bfs a_star --workers 4 \
+        --timeout 60 --format csv --output hasil.csv
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import tracemalloc
+
+from rushhour_state import RushHourState
+from rushhour_search import SOLVERS, SearchStats
+
+FIELDS = ['puzzle', 'algorithm', 'status', 'moves', 'time_s',
+          'expanded', 'generated', 'peak_kb', 'error']
+
+
+def _run_task(conn, csv_path, algorithm, trace_memory):
+    """Dijalankan di proses worker; mengirim satu dict hasil lewat `conn`."""
+    # print dari solver jangan sampai tercampur dengan output JSONL/CSV
+    sys.stdout = sys.stderr
+    try:
+        state = RushHourState.from_csv(csv_path)
+        stats = SearchStats()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        path = SOLVERS[algorithm](state, stats=stats)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1024 if trace_memory else None
+        conn.send({
+            'status': 'solved' if path is not None else 'unsolved',
+            'moves': len(path) if path is not None else None,
+            'path': path,
+            'time_s': round(elapsed, 4),
+            'expanded': stats.expanded,
+            'generated': stats.generated,
+            'peak_kb': round(peak, 1) if peak is not None else None,
+        })
+    except Exception as e:
+        conn.send({'status': 'error', 'error': repr(e)})
+    finally:
+        conn.close()
+
+
+def run_batch(tasks, workers=os.cpu_count(), timeout=60.0, trace_memory=True):
+    """
+    tasks: iterable (csv_path, algorithm). Generator yang menghasilkan dict
+    hasil sesuai urutan selesai; task yang lewat `timeout` detik dimatikan
+    dan dilaporkan dengan status 'timeout'.
+    """
+    ctx = multiprocessing.get_context()
+    pending = list(tasks)
+    running = []
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                csv_path, algorithm = pending.pop(0)
+                recv, send = ctx.Pipe(duplex=False)
+                # bukan daemon: bfs_parallel dan simulated_annealing dengan
+                # workers > 1 membuat proses anak sendiri
+                proc = ctx.Process(target=_run_task,
+                                   args=(send, csv_path, algorithm, trace_memory))
+                proc.start()
+                send.close()
+                running.append((proc, recv, csv_path, algorithm, time.monotonic() + timeout))
+
+            ready = multiprocessing.connection.wait([task[1] for task in running], timeout=0.05)
+            still_running = []
+            for proc, recv, csv_path, algorithm, deadline in running:
+                result = {'puzzle': os.path.basename(csv_path), 'algorithm': algorithm}
+                if recv in ready:
+                    try:
+                        result.update(recv.recv())
+                    except EOFError:
+                        result.update(status='error', error=f"worker exit code {proc.exitcode}")
+                    proc.join()
+                elif time.monotonic() > deadline:
+                    proc.terminate()
+                    proc.join()
+                    result.update(status='timeout', time_s=timeout)
+                else:
+                    still_running.append((proc, recv, csv_path, algorithm, deadline))
+                    continue
+                recv.close()
+                yield result
+            running = still_running
+    finally:
+        # generator ditinggalkan / KeyboardInterrupt: proses non-daemon
+        # tidak mati sendiri saat interpreter keluar
+        for proc, recv, *_ in running:
+            proc.terminate()
+            proc.join()
+            recv.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder')
+    parser.add_argument('--algorithms', nargs='+', default=['bfs'], choices=sorted(SOLVERS))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--timeout', type=float, default=60.0, help="detik per task")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--output', help="file output (default stdout)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="tanpa tracemalloc (lebih cepat, peak_kb kosong)")
+    args = parser.parse_args(argv)
+
+    files = sorted(os.path.join(args.folder, f) for f in os.listdir(args.folder)
+                   if f.endswith('.csv'))
+    tasks = [(path, algo) for path in files for algo in args.algorithms]
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        for result in run_batch(tasks, args.workers, args.timeout, not args.no_memory):
+            if args.format == 'csv':
+                writer.writerow(result)
+            else:
+                out.write(json.dumps(result) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
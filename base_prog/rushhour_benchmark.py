@@ -0,0 +1,644 @@
+"""
+Benchmark untuk solver Rush Hour.
+
+Suite utama (menggantikan metrics.ipynb): tiap solver di SOLVERS x tiap
+puzzle dijalankan --repeat kali, median waktu + counter SearchStats +
+peak tracemalloc ditulis ke CSV yang bisa di-diff antar versi.
+
+    python rushhour_benchmark.py suite --output hasil.csv
+    python rushhour_benchmark.py compare lama.csv baru.csv
+
+Microbenchmark:
+
+    python rushhour_benchmark.py expansion
+    python rushhour_benchmark.py memory
+    python rushhour_benchmark.py keys
+    python rushhour_benchmark.py bfs-policy
+    python rushhour_benchmark.py heuristics
+    python rushhour_benchmark.py ida
+    python rushhour_benchmark.py macro
+    python rushhour_benchmark.py scaling
+    python rushhour_benchmark.py beam
+    python rushhour_benchmark.py numpy      (butuh numpy)
+    python rushhour_benchmark.py parallel
+"""
+import argparse
+import contextlib
+import csv
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+from rushhour_state import RushHourState, Car
+from rushhour_search import (move_car, bfs, ac3_bfs, a_star, a_star_moves, ida_star,
+                             beam_search, parallel_bfs, get_neighbors_astar,
+                             heuristic_blockers_of_blockers,
+                             HEURISTICS, SOLVERS, SearchStats)
+
+DATASET_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dataaset')
+
+
+def dataset_files(folder=DATASET_FOLDER):
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.csv'))
+
+
+def sample_states(state, count, seed=0):
+    """Random walk of `count` compact states starting from `state`."""
+    rng = random.Random(seed)
+    cur = state.to_compact()
+    states = [cur]
+    while len(states) < count:
+        cur = rng.choice(cur.neighbors())[0]
+        states.append(cur)
+    return states
+
+
+def _expand_rebuild(state):
+    """Expansion the way move_car used to check it: occupied() per candidate."""
+    count = 0
+    for car in state.cars.values():
+        if not car.movable:
+            continue
+        for delta in (-1, 1):
+            head = (car.col if car.orientation == 'h' else car.row) + delta
+            span = state.cols if car.orientation == 'h' else state.rows
+            if not 0 <= head <= span - car.length:
+                continue
+            others = state.occupied() - set(car.positions())
+            if car.orientation == 'h':
+                cells = [(car.row, head + i) for i in range(car.length)]
+            else:
+                cells = [(head + i, car.col) for i in range(car.length)]
+            if not any(pos in others for pos in cells):
+                count += 1
+    return count
+
+
+def _expand_grid(state):
+    """Expansion with the incremental grid: move_car then undo it."""
+    count = 0
+    for car in state.cars.values():
+        if not car.movable:
+            continue
+        for delta in (-1, 1):
+            if move_car(car, delta, state):
+                move_car(car, -delta, state)
+                count += 1
+    return count
+
+
+def _expand_compact(state):
+    return len(state.neighbors())
+
+
+def _per_call(fn, states, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for st in states:
+            fn(st)
+    return (time.perf_counter() - start) / (repeat * len(states))
+
+
+def bench_expansion(files=None, samples=200, repeat=5):
+    """Per-expansion cost (microseconds) before/after the occupancy grid."""
+    print(f"{'puzzle':<12}{'rebuild':>10}{'grid':>10}{'compact':>10}{'speedup':>10}")
+    for path in files or dataset_files():
+        compact = sample_states(RushHourState.from_csv(path), samples)
+        mutable = [st.to_state() for st in compact]
+        for st in mutable:
+            st.grid()
+            assert _expand_rebuild(st) == _expand_grid(st)
+
+        rebuild = _per_call(_expand_rebuild, mutable, repeat) * 1e6
+        grid = _per_call(_expand_grid, mutable, repeat) * 1e6
+        packed = _per_call(_expand_compact, compact, repeat) * 1e6
+        name = os.path.basename(path)
+        print(f"{name:<12}{rebuild:>10.1f}{grid:>10.1f}{packed:>10.1f}{rebuild / grid:>9.1f}x")
+
+
+def _bfs_path_copies(state):
+    """The old bfs frontier layout: every queue entry owns path + [move]."""
+    visited = set()
+    queue = deque([(state.to_compact(), [])])
+    while queue:
+        st, path = queue.popleft()
+        if st.key() in visited:
+            continue
+        visited.add(st.key())
+        if st.is_goal():
+            return path
+        for nxt, move_info in st.neighbors():
+            queue.append((nxt, path + [move_info]))
+    return None
+
+
+def peak_memory(fn, *args):
+    """(result, tracemalloc peak in KB) of fn(*args)."""
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / 1024
+
+
+def bench_memory(files=None):
+    """tracemalloc peak of bfs with path copies vs the parent table."""
+    print(f"{'puzzle':<12}{'moves':>7}{'copies KB':>12}{'parents KB':>12}{'ratio':>8}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path)
+        old, old_peak = peak_memory(_bfs_path_copies, state)
+        new, new_peak = peak_memory(bfs, state, False)
+        assert len(old) == len(new)
+        name = os.path.basename(path)
+        print(f"{name:<12}{len(new):>7}{old_peak:>12.0f}{new_peak:>12.0f}{old_peak / new_peak:>7.1f}x")
+
+
+def _component(state):
+    """Every state reachable from `state`, via a plain BFS."""
+    start = state.to_compact()
+    seen = {start.key(): start}
+    layer = [start]
+    while layer:
+        next_layer = []
+        for st in layer:
+            for nxt, _ in st.neighbors():
+                if nxt.key() not in seen:
+                    seen[nxt.key()] = nxt
+                    next_layer.append(nxt)
+        layer = next_layer
+    return list(seen.values())
+
+
+def _car_tuple_key(st):
+    """The old visited key: (id, row, col) for every car."""
+    board = st.board
+    return tuple((cid, *board.cell(i, st.heads[i])) for i, cid in enumerate(board.ids))
+
+
+def _key_bytes(key):
+    """Bytes a visited set keeps alive for `key` (small ints/ids are shared)."""
+    if isinstance(key, tuple):
+        return sys.getsizeof(key) + sum(_key_bytes(k) for k in key)
+    if isinstance(key, int) and not -5 <= key <= 256:
+        return sys.getsizeof(key)
+    return 0
+
+
+def bench_keys(files=None):
+    """
+    Visited-set size for the whole reachable component under each key:
+    (id, row, col) tuples, the heads tuple, key() (packed integer) and
+    Board.symmetric_key (interchangeable cars merged). KB = set table +
+    the key objects it holds.
+    """
+    kinds = (('cars', _car_tuple_key), ('heads', lambda st: st.heads),
+             ('packed', lambda st: st.key()),
+             ('symmetric', lambda st: st.board.symmetric_key(st.heads)))
+    print(f"{'puzzle':<12}{'groups':>7}" + ''.join(f"{k + ' n':>12}{'KB':>8}" for k, _ in kinds))
+    for path in files or dataset_files():
+        states = _component(RushHourState.from_csv(path))
+        line = f"{os.path.basename(path):<12}{len(states[0].board.groups):>7}"
+        for _, key in kinds:
+            visited = {key(st) for st in states}
+            size = sys.getsizeof(visited) + sum(_key_bytes(k) for k in visited)
+            line += f"{len(visited):>12}{size / 1024:>8.0f}"
+        print(line)
+
+
+def bench_bfs_policy(files=None):
+    """Goal/duplicate test on pop vs on generation, for bfs and ac3_bfs."""
+    print(f"{'puzzle':<12}{'solver':<9}{'policy':<10}{'moves':>6}{'expanded':>10}"
+          f"{'generated':>11}{'dups':>9}{'frontier':>10}{'peak KB':>9}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path)
+        name = os.path.basename(path)
+        for label, solver in (('bfs', bfs), ('ac3_bfs', ac3_bfs)):
+            for policy, on_generate in (('pop', False), ('generate', True)):
+                stats = SearchStats()
+                moves, peak = peak_memory(solver, state, on_generate, stats)
+                print(f"{name:<12}{label:<9}{policy:<10}{len(moves):>6}{stats.expanded:>10}"
+                      f"{stats.generated:>11}{stats.duplicates:>9}{stats.frontier_peak:>10}{peak:>9.0f}")
+
+
+def bench_heuristics(files=None):
+    """
+    Nodes expanded per heuristic in HEURISTICS, for the generic a_star
+    (states as dict keys, move attribute) and a_star_moves (compact keys,
+    closed set).
+    """
+    print(f"{'puzzle':<12}{'heuristic':<12}{'moves':>6}{'a_star exp':>11}{'time s':>8}"
+          f"{'moves exp':>11}{'stale':>7}{'time s':>8}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path, compact=True)
+        name = os.path.basename(path)
+        for heuristic in HEURISTICS:
+            generic = SearchStats()
+            start = time.perf_counter()
+            states, _ = a_star(state, lambda s: s.is_goal(), get_neighbors_astar,
+                               heuristic, None, generic)
+            generic_time = time.perf_counter() - start
+
+            keyed = SearchStats()
+            start = time.perf_counter()
+            moves = a_star_moves(state, heuristic, keyed)
+            keyed_time = time.perf_counter() - start
+            assert len(moves) == len(states) - 1
+            print(f"{name:<12}{heuristic:<12}{len(moves):>6}{generic.expanded:>11}{generic_time:>8.3f}"
+                  f"{keyed.expanded:>11}{keyed.duplicates:>7}{keyed_time:>8.3f}")
+
+
+def bench_ida(files=None, heuristic='manhattan', table_size=1 << 12):
+    """Peak memory of ida_star with a small transposition table vs a_star_moves."""
+    print(f"{'puzzle':<12}{'moves':>6}{'a* KB':>8}{'ida* KB':>9}{'ida* exp':>10}{'time s':>8}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path, compact=True)
+        name = os.path.basename(path)
+        optimal, astar_peak = peak_memory(a_star_moves, state, heuristic)
+        stats = SearchStats()
+        start = time.perf_counter()
+        moves, ida_peak = peak_memory(ida_star, state, heuristic, 500, table_size, stats)
+        elapsed = time.perf_counter() - start
+        assert len(moves) == len(optimal)
+        print(f"{name:<12}{len(moves):>6}{astar_peak:>8.0f}{ida_peak:>9.0f}{stats.expanded:>10}{elapsed:>8.2f}")
+
+
+def bench_macro(files=None):
+    """
+    Unit slides vs macro moves: path length in both metrics (vehicle moves,
+    cells slid), nodes expanded and frontier peak per solver/move model.
+    """
+    runs = (('bfs', 'unit', lambda st, stats: bfs(st, True, stats)),
+            ('bfs', 'macro', lambda st, stats: bfs(st, True, stats, 'macro')),
+            ('a_star', 'macro_slides',
+             lambda st, stats: a_star_moves(st, 'manhattan', stats, 'macro_slides')),
+            ('a_star', 'macro',
+             lambda st, stats: a_star_moves(st, 'vehicle_moves', stats, 'macro')))
+    print(f"{'puzzle':<12}{'solver':<8}{'moves':<14}{'vehicle':>8}{'slides':>8}"
+          f"{'expanded':>10}{'frontier':>10}{'time s':>8}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path, compact=True)
+        name = os.path.basename(path)
+        for label, moves, solver in runs:
+            stats = SearchStats()
+            start = time.perf_counter()
+            result = solver(state, stats)
+            elapsed = time.perf_counter() - start
+            slides = sum(abs(delta) for _, delta in result)
+            print(f"{name:<12}{label:<8}{moves:<14}{len(result):>8}{slides:>8}"
+                  f"{stats.expanded:>10}{stats.frontier_peak:>10}{elapsed:>8.2f}")
+
+
+def random_puzzle(rows, cols, cars, walk=200, seed=0):
+    """
+    Puzzle acak rows x cols yang pasti bisa diselesaikan: mobil 'sh' mulai
+    di pintu keluar (baris (rows - 1) // 2), sampai `cars` mobil lain (2/3
+    sel, horizontal tidak di baris 'sh') ditaruh acak, lalu state diacak
+    dengan `walk` langkah random; langkah bisa dibalik, jadi solusi ada.
+    Yang dikembalikan state di walk itu dengan heuristik 'blockers'
+    terbesar, supaya puzzle tidak terlalu dekat ke goal.
+    """
+    rng = random.Random(seed)
+    red_row = (rows - 1) // 2
+    placed = {'sh': Car('sh', 'h', 2, red_row, cols - 2)}
+    taken = set(placed['sh'].positions())
+    count = {'h': 0, 'v': 0}
+    for _ in range(1000 * cars):
+        if len(placed) > cars:
+            break
+        ori, length = rng.choice('hv'), rng.choice((2, 2, 3))
+        if ori == 'h':
+            row, col = rng.randrange(rows), rng.randrange(cols - length + 1)
+            if row == red_row:
+                continue
+        else:
+            row, col = rng.randrange(rows - length + 1), rng.randrange(cols)
+        car = Car(f"{ori}{count[ori] + 1}", ori, length, row, col)
+        if taken & set(car.positions()):
+            continue
+        count[ori] += 1
+        placed[car.id] = car
+        taken |= set(car.positions())
+
+    state = RushHourState(placed, (rows, cols)).to_compact()
+    hardest, worst = state, 0
+    for _ in range(walk):
+        neighbors = state.neighbors()
+        if not neighbors:
+            break
+        state = rng.choice(neighbors)[0]
+        h = heuristic_blockers_of_blockers(state, None)
+        if h > worst:
+            hardest, worst = state, h
+    if hardest.is_goal():
+        return random_puzzle(rows, cols, cars, walk, seed + 1000)
+    return hardest.to_state()
+
+
+SCALING_CONFIGS = [(6, 6, 8), (6, 6, 12), (8, 8, 12), (8, 8, 20), (10, 10, 20), (10, 10, 30),
+                   (8, 12, 24)]
+
+
+def bench_scaling(configs=SCALING_CONFIGS, algorithms=('a_star', 'bfs'), seeds=3, timeout=10.0):
+    """
+    Pertumbuhan biaya dengan ukuran papan dan jumlah mobil. Per konfigurasi
+    (rows, cols, cars): biaya satu ekspansi (neighbors) dan jumlah langkah
+    legal per state, lalu tiap solver dijalankan pada `seeds` puzzle
+    random_puzzle lewat rushhour_batch.run_batch (satu proses per puzzle,
+    `timeout` detik). Median moves/expanded/waktu/peak dihitung dari puzzle
+    yang selesai; sulitnya puzzle acak sangat bervariasi, jadi jumlah yang
+    selesai ikut dilaporkan.
+    """
+    from rushhour_batch import run_batch
+
+    print(f"{'board':<8}{'cars':>5}{'us/exp':>8}{'moves/st':>9}  {'solver':<10}{'solved':>7}"
+          f"{'sol':>5}{'expanded':>10}{'time s':>8}{'peak KB':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        for rows, cols, cars in configs:
+            files = []
+            for seed in range(seeds):
+                path = os.path.join(folder, f"{rows}x{cols}_{cars}_{seed}.csv")
+                random_puzzle(rows, cols, cars, 2000, seed).to_csv(path)
+                files.append(path)
+            samples = [st for path in files
+                       for st in sample_states(RushHourState.from_csv(path), 50)]
+            per_call = _per_call(_expand_compact, samples, 3) * 1e6
+            branching = statistics.mean(len(st.neighbors()) for st in samples)
+
+            tasks = [(path, algo) for algo in algorithms for path in files]
+            results = list(run_batch(tasks, workers=1, timeout=timeout))
+            for algo in algorithms:
+                done = [r for r in results if r['algorithm'] == algo and r['status'] == 'solved']
+                line = f"{f'{rows}x{cols}':<8}{cars:>5}{per_call:>8.1f}{branching:>9.1f}  " \
+                       f"{algo:<10}{f'{len(done)}/{seeds}':>7}"
+                if done:
+                    line += (f"{statistics.median(r['moves'] for r in done):>5.0f}"
+                             f"{statistics.median(r['expanded'] for r in done):>10.0f}"
+                             f"{statistics.median(r['time_s'] for r in done):>8.3f}"
+                             f"{statistics.median(r['peak_kb'] for r in done):>10.0f}")
+                print(line, flush=True)
+
+
+BEAM_WIDTHS = (10, 100, 1000, 3000)
+BEAM_RANDOM = [(10, 10, 30), (12, 12, 40)]
+
+
+def bench_beam(files=None, widths=BEAM_WIDTHS, configs=BEAM_RANDOM, seeds=2, heuristic='blocking',
+               timeout=10.0):
+    """
+    Kualitas solusi beam_search vs lebar beam. Pembanding a_star (optimal)
+    lewat run_batch dengan `timeout` detik per puzzle, pada dataset dan
+    `seeds` random_puzzle per konfigurasi di `configs`. Per lebar: panjang
+    path, rasio terhadap optimal, node diekspansi, waktu, dan peak
+    tracemalloc, dibandingkan dengan peak a_star.
+    """
+    from rushhour_batch import run_batch
+
+    print(f"{'puzzle':<16}{'solver':<12}{'moves':>6}{'x opt':>7}{'expanded':>10}"
+          f"{'time s':>8}{'peak KB':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        puzzles = list(files or dataset_files())
+        for rows, cols, cars in configs:
+            for seed in range(seeds):
+                path = os.path.join(folder, f"{rows}x{cols}_{cars}_{seed}.csv")
+                random_puzzle(rows, cols, cars, 2000, seed).to_csv(path)
+                puzzles.append(path)
+        reference = {r['puzzle']: r for r in run_batch([(path, 'a_star') for path in puzzles],
+                                                        workers=1, timeout=timeout)}
+        for path in puzzles:
+            state = RushHourState.from_csv(path, compact=True)
+            name = os.path.basename(path)
+            ref = reference[name]
+            optimal = ref.get('moves') if ref['status'] == 'solved' else None
+            print(f"{name:<16}{'a_star':<12}{str(optimal or ref['status']):>6}{'':>7}"
+                  f"{str(ref.get('expanded') or ''):>10}{ref['time_s']:>8.2f}"
+                  f"{str(ref.get('peak_kb') or ''):>10}")
+            for width in widths:
+                stats = SearchStats()
+                start = time.perf_counter()
+                result, peak = peak_memory(beam_search, state, width, heuristic, 10000, stats)
+                elapsed = time.perf_counter() - start
+                moves = len(result) if result is not None else None
+                ratio = f"{moves / optimal:.2f}" if moves and optimal else ''
+                print(f"{'':<16}{f'beam {width}':<12}{str(moves or '-'):>6}{ratio:>7}"
+                      f"{stats.expanded:>10}{elapsed:>8.2f}{peak:>10.0f}", flush=True)
+
+
+def bench_numpy(files=None, samples=2000, repeat=3):
+    """
+    bfs (satu state per ekspansi, Python) vs bfs_numpy (rushhour_vector,
+    satu layer per iterasi): waktu, state diekspansi per detik, speedup,
+    dan panjang path yang harus sama. Lalu throughput ekspansi murni:
+    `samples` state acak dari komponen puzzle sebagai satu batch
+    expand_layer vs neighbors() per state.
+    """
+    try:
+        import numpy as np
+        from rushhour_vector import bfs_vectorized, expand_layer
+    except ImportError:
+        sys.exit("bench numpy butuh numpy")
+
+    print(f"{'puzzle':<12}{'moves':>6}{'bfs st/s':>10}{'numpy st/s':>12}{'speedup':>8}"
+          f"{'exp us/st':>10}{'batch us/st':>12}{'speedup':>8}")
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path)
+        rates = []
+        for solver in (bfs, bfs_vectorized):
+            best = math.inf
+            for _ in range(repeat):
+                stats = SearchStats()
+                start = time.perf_counter()
+                result = solver(state, stats=stats)
+                best = min(best, time.perf_counter() - start)
+            rates.append((len(result), stats.expanded / best))
+        assert rates[0][0] == rates[1][0]
+
+        states = sample_states(state, samples)
+        codes = np.array([st.key() for st in states], dtype=np.uint64)
+        per_state = _per_call(_expand_compact, states, repeat)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            expand_layer(states[0].board, codes)
+        per_batch = (time.perf_counter() - start) / repeat / len(states)
+        name = os.path.basename(path)
+        print(f"{name:<12}{rates[0][0]:>6}{rates[0][1]:>10.0f}{rates[1][1]:>12.0f}"
+              f"{rates[1][1] / rates[0][1]:>7.1f}x{per_state * 1e6:>10.2f}{per_batch * 1e6:>12.2f}"
+              f"{per_state / per_batch:>7.1f}x")
+
+
+PARALLEL_PUZZLES = ('game3.csv', 'game2.csv', 'game4.csv')     # bfs expanded terbanyak
+PARALLEL_WORKERS = (1, 2, 4, 8)
+
+
+def bench_parallel(files=None, workers=PARALLEL_WORKERS, repeat=3,
+                   random_configs=((8, 8, 12, 2),)):
+    """
+    Speedup parallel_bfs vs jumlah worker pada puzzle dataset tersulit
+    (PARALLEL_PUZZLES) dan random_puzzle besar (rows, cols, cars, seed),
+    dengan bfs satu proses sebagai pembanding. Waktu = minimum `repeat`
+    run; speedup relatif terhadap 1 worker. Angka di atas os.cpu_count()
+    worker tidak bermakna.
+    """
+    puzzles = [(os.path.basename(path), RushHourState.from_csv(path))
+               for path in files or [os.path.join(DATASET_FOLDER, f) for f in PARALLEL_PUZZLES]]
+    puzzles += [(f"{rows}x{cols}_{cars}_{seed}", random_puzzle(rows, cols, cars, 2000, seed))
+                for rows, cols, cars, seed in random_configs]
+
+    def best_time(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    print(f"cpu_count = {os.cpu_count()}")
+    print(f"{'puzzle':<16}{'solver':<14}{'moves':>6}{'time s':>8}{'st/s':>9}{'speedup':>8}")
+    for name, state in puzzles:
+        stats = SearchStats()
+        elapsed, result = best_time(lambda: bfs(state, stats=stats))
+        expanded = stats.expanded // repeat
+        print(f"{name:<16}{'bfs':<14}{len(result):>6}{elapsed:>8.2f}{expanded / elapsed:>9.0f}")
+        base = None
+        for count in workers:
+            elapsed, path = best_time(lambda: parallel_bfs(state, count))
+            assert len(path) == len(result)
+            base = base or elapsed
+            print(f"{'':<16}{f'parallel {count}':<14}{len(path):>6}{elapsed:>8.2f}"
+                  f"{expanded / elapsed:>9.0f}{base / elapsed:>7.2f}x", flush=True)
+
+
+# iddfs (max_depth 40) dan ida_star terlalu lambat untuk dijalankan default
+DEFAULT_SUITE = ['bfs', 'ac3_bfs', 'bidirectional_bfs', 'a_star', 'ac3_dfs', 'ac3_mac',
+                 'anytime_a_star', 'simulated_annealing']
+SUITE_FIELDS = ['puzzle', 'algorithm', 'solved', 'moves', 'runs', 'time_median_s', 'time_min_s',
+                'expanded', 'generated', 'duplicates', 'frontier_peak', 'pruned', 'peak_kb']
+
+
+def run_suite(files=None, algorithms=DEFAULT_SUITE, repeat=5, seed=0):
+    """
+    List baris hasil (dict dengan SUITE_FIELDS). Waktu diukur tanpa
+    tracemalloc; peak memori dari satu run terpisah. Run ke-r memakai
+    random.seed(seed + r) sehingga simulated annealing bisa diulang.
+    """
+    rows = []
+    for path in files or dataset_files():
+        state = RushHourState.from_csv(path)
+        for algo in algorithms:
+            solver = SOLVERS[algo]
+            times, lengths, counters = [], [], []
+            for r in range(repeat):
+                random.seed(seed + r)
+                stats = SearchStats()
+                with contextlib.redirect_stdout(None):
+                    start = time.perf_counter()
+                    moves = solver(state, stats=stats)
+                    times.append(time.perf_counter() - start)
+                if moves is not None:
+                    lengths.append(len(moves))
+                counters.append(stats.as_dict())
+
+            random.seed(seed)
+            with contextlib.redirect_stdout(None):
+                _, peak = peak_memory(solver, state)
+
+            row = {
+                'puzzle': os.path.basename(path),
+                'algorithm': algo,
+                'solved': len(lengths),
+                'moves': statistics.median_low(lengths) if lengths else '',
+                'runs': repeat,
+                'time_median_s': round(statistics.median(times), 5),
+                'time_min_s': round(min(times), 5),
+                'peak_kb': round(peak, 1),
+            }
+            for name in SearchStats.COUNTERS:
+                row[name] = statistics.median_low(c[name] for c in counters)
+            rows.append(row)
+    return rows
+
+
+def write_rows(rows, path=None):
+    out = open(path, 'w', newline='') if path else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=SUITE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def compare(old_path, new_path):
+    """Rasio waktu/node/memori per (puzzle, algoritma) antara dua hasil suite."""
+    def load(path):
+        with open(path, newline='') as f:
+            return {(row['puzzle'], row['algorithm']): row for row in csv.DictReader(f)}
+
+    def ratio(old, new):
+        old, new = float(old or 0), float(new or 0)
+        return f"{new / old:.2f}x" if old else '-'
+
+    old, new = load(old_path), load(new_path)
+    print(f"{'puzzle':<12}{'algorithm':<20}{'moves':>12}{'time':>8}{'expanded':>10}{'peak':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        moves = f"{a['moves']}->{b['moves']}" if a['moves'] != b['moves'] else b['moves']
+        print(f"{key[0]:<12}{key[1]:<20}{moves:>12}{ratio(a['time_median_s'], b['time_median_s']):>8}"
+              f"{ratio(a['expanded'], b['expanded']):>10}{ratio(a['peak_kb'], b['peak_kb']):>8}")
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"{key[0]:<12}{key[1]:<20} hanya ada di {'lama' if key in old else 'baru'}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('bench', choices=['suite', 'compare', 'expansion', 'memory', 'keys',
+                                          'bfs-policy', 'heuristics', 'ida', 'macro',
+                                          'scaling', 'beam', 'numpy', 'parallel'])
+    parser.add_argument('files', nargs='*', help="compare: hasil lama dan baru")
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(SOLVERS),
+                        help="suite: default DEFAULT_SUITE; scaling: default a_star bfs")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="scaling/beam: detik per puzzle")
+    parser.add_argument('--output', help="suite: file CSV (default stdout)")
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.bench == 'suite':
+        write_rows(run_suite(algorithms=args.algorithms or DEFAULT_SUITE, repeat=args.repeat),
+                   args.output)
+    elif args.bench == 'compare':
+        if len(args.files) != 2:
+            parser.error("compare butuh dua file hasil suite")
+        compare(*args.files)
+    elif args.bench == 'expansion':
+        bench_expansion(samples=args.samples, repeat=args.repeat)
+    elif args.bench == 'memory':
+        bench_memory()
+    elif args.bench == 'keys':
+        bench_keys()
+    elif args.bench == 'bfs-policy':
+        bench_bfs_policy()
+    elif args.bench == 'heuristics':
+        bench_heuristics()
+    elif args.bench == 'ida':
+        bench_ida()
+    elif args.bench == 'macro':
+        bench_macro()
+    elif args.bench == 'scaling':
+        bench_scaling(algorithms=args.algorithms or ('a_star', 'bfs'), timeout=args.timeout)
+    elif args.bench == 'beam':
+        bench_beam(timeout=args.timeout)
+    elif args.bench == 'numpy':
+        bench_numpy(repeat=args.repeat)
+    elif args.bench == 'parallel':
+        bench_parallel(repeat=args.repeat)
@@ -0,0 +1,105 @@
+"""
+Cache solusi persisten di depan solver rushhour_search.
+
+Key = hash dari algoritma + encoding kanonik papan (ukuran grid, sisi
+keluar, lalu orientasi/panjang/posisi tiap mobil dalam urutan terurut),
+jadi penomoran id mobil (h1, v3, ...) tidak berpengaruh. Langkah disimpan sebagai index
+mobil kanonik dan diterjemahkan kembali ke id mobil pemanggil saat dibaca.
+Satu file JSON per entri; kalau jumlah entri melewati batas, entri yang
+paling lama tidak dipakai (mtime) dihapus.
+"""
+import hashlib
+import json
+import os
+
+from rushhour_search import as_compact
+
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.rushhour_cache')
+
+
+def canonical_order(state):
+    """Index mobil `state` dalam urutan kanonik ('sh' dulu, lalu terurut)."""
+    state = as_compact(state)
+    board = state.board
+    return sorted(range(len(board.ids)),
+                  key=lambda i: (i != board.red, board.orientations[i], board.lengths[i],
+                                 board.cell(i, state.heads[i])))
+
+
+def canonical_key(state):
+    state = as_compact(state)
+    board = state.board
+    cars = ';'.join('{}{}@{},{}'.format(board.orientations[i], board.lengths[i],
+                                        *board.cell(i, state.heads[i]))
+                    for i in canonical_order(state))
+    return f"{board.rows}x{board.cols}:{board.exit}:{cars}"
+
+
+class SolutionCache:
+
+    def __init__(self, folder=DEFAULT_FOLDER, max_entries=1000):
+        self.folder = folder
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, algo, state):
+        digest = hashlib.sha1(f"{algo}|{canonical_key(state)}".encode()).hexdigest()
+        return os.path.join(self.folder, digest + '.json')
+
+    def get(self, algo, state):
+        """Path tersimpan untuk (algo, state), atau None kalau belum ada."""
+        path = self._path(algo, state)
+        try:
+            with open(path) as f:
+                moves = json.load(f)['moves']
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        state = as_compact(state)
+        ids = [state.board.ids[i] for i in canonical_order(state)]
+        return [(ids[i], delta) for i, delta in moves]
+
+    def put(self, algo, state, moves):
+        state = as_compact(state)
+        index = {state.board.ids[i]: k for k, i in enumerate(canonical_order(state))}
+        path = self._path(algo, state)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'algo': algo, 'board': canonical_key(state),
+                       'moves': [[index[cid], delta] for cid, delta in moves]}, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        entries = [os.path.join(self.folder, f) for f in os.listdir(self.folder)
+                   if f.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def solve(self, algo, solver, state, *args, **kwargs):
+        """
+        solver(state, *args, **kwargs) lewat cache. `algo` harus unik per
+        algoritma + parameter yang mempengaruhi hasil (mis. 'a_star:blocking').
+        Hasil None (gagal/buntu) tidak disimpan.
+        """
+        moves = self.get(algo, state)
+        if moves is None:
+            moves = solver(state, *args, **kwargs)
+            if moves is not None:
+                self.put(algo, state, moves)
+        return moves
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"cache: {self.hits} hit, {self.misses} miss ({rate:.0f}% hit)"
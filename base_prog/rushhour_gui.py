@@ -1,11 +1,19 @@
-import os, threading, time, pygame, sys
+import os, time, pygame, sys
 from rushhour_state import RushHourState
 from rushhour_search import *
+from rushhour_cache import SolutionCache
+from rushhour_postprocess import shorten
+from rushhour_runner import SolveJob
 
 CELL_SIZE = 80
 HEADER_HEIGHT = 60 
 SCREEN_SIZE = CELL_SIZE * 6
 WINDOW_HEIGHT = SCREEN_SIZE + HEADER_HEIGHT
+MAX_BOARD_PIXELS = 800        # papan besar (8x8, 10x10, ...) diperkecil sampai muat
+
+# ukuran papan yang sedang digambar; diubah oleh set_board()
+cell_size = CELL_SIZE
+board_width = board_height = SCREEN_SIZE
 
 COLORS = {
     'sh': (255, 0, 0),
@@ -18,46 +26,99 @@ COLORS = {
 MAX_ITER = 2000
 START_TEMP = 100
 COOLING_RATE = 0.995
-
-
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_SIZE, WINDOW_HEIGHT))
-pygame.display.set_caption("Rush Hour")
-font = pygame.font.SysFont(None, 36)
-
-car_images = {
-    'sh2': pygame.image.load('aset\\tcar-h.png'),
-    'h2': pygame.image.load('aset\\car-h.png'),
-    'h3': pygame.image.load('aset\\truck-h.png'),
-    'v2': pygame.image.load('aset\\car-v.png'),
-    'v3': pygame.image.load('aset\\truck-v.png'),
-    'b1': pygame.image.load('aset\\box.png')
+RESTARTS = 8                  # run independen (seed berbeda), path terbaik diambil
+WORKERS = os.cpu_count()      # proses paralel untuk restart
+SHORTEN = True                # buang loop / langkah bolak-balik sebelum animasi
+
+# True: solver mencatat waktu per fase (neighbors, visited, frontier, ...)
+# dan laporannya dicetak ke konsol setelah solve
+PROFILE = False
+
+# budget solve (None = tanpa batas); Esc membatalkan solve yang sedang jalan
+TIME_LIMIT = None             # detik
+MAX_EXPANDED = None           # jumlah node yang diekspansi
+
+# menu -> (nama di SOLVERS, key cache atau None, argumen tambahan)
+ALGORITHMS = {
+    'bfs': ('bfs', 'bfs', {}),
+    'astar': ('a_star', 'a_star_moves:manhattan', {'heuristic': 'manhattan'}),
+    'ac3': ('ac3_bfs', 'ac3_bfs', {}),
+    'anytime': ('anytime_a_star', 'anytime_a_star:blocking', {}),
+    'sa': ('simulated_annealing', None,
+           {'max_iter': MAX_ITER, 'start_temp': START_TEMP, 'cooling_rate': COOLING_RATE,
+            'restarts': RESTARTS, 'workers': WORKERS}),
 }
 
-def draw_background_grid():
+screen = font = None
+car_images = {}
+
+
+def init_display():
+    """
+    Window, font, dan gambar mobil. Tidak dijalankan saat modul di-import,
+    supaya proses solver (spawn meng-import ulang modul utama) tidak ikut
+    membuka window.
+    """
+    global screen, font, car_images
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_SIZE, WINDOW_HEIGHT))
+    pygame.display.set_caption("Rush Hour")
+    font = pygame.font.SysFont(None, 36)
+
+    car_images = {
+        'sh2': pygame.image.load('aset\\tcar-h.png'),
+        'h2': pygame.image.load('aset\\car-h.png'),
+        'h3': pygame.image.load('aset\\truck-h.png'),
+        'v2': pygame.image.load('aset\\car-v.png'),
+        'v3': pygame.image.load('aset\\truck-v.png'),
+        'b1': pygame.image.load('aset\\box.png')
+    }
+
+def set_board(state):
+    """Sesuaikan ukuran sel dan window dengan papan rows x cols milik `state`."""
+    global screen, cell_size, board_width, board_height
+    cell_size = min(CELL_SIZE, MAX_BOARD_PIXELS // max(state.rows, state.cols))
+    board_width, board_height = state.cols * cell_size, state.rows * cell_size
+    screen = pygame.display.set_mode((max(board_width, SCREEN_SIZE),
+                                      board_height + HEADER_HEIGHT))
+
+
+def draw_background_grid(state):
     screen.fill((42, 42, 41))
 
-    for i in range(7):
-        
+    for i in range(state.rows + 1):
         pygame.draw.line(screen, (21, 21, 20),
-                         (0, i * CELL_SIZE + HEADER_HEIGHT),
-                         (SCREEN_SIZE, i * CELL_SIZE + HEADER_HEIGHT), 2)
-  
+                         (0, i * cell_size + HEADER_HEIGHT),
+                         (board_width, i * cell_size + HEADER_HEIGHT), 2)
+    for i in range(state.cols + 1):
         pygame.draw.line(screen, (21, 21, 20),
-                         (i * CELL_SIZE, HEADER_HEIGHT),
-                         (i * CELL_SIZE, HEADER_HEIGHT + SCREEN_SIZE), 2)
+                         (i * cell_size, HEADER_HEIGHT),
+                         (i * cell_size, HEADER_HEIGHT + board_height), 2)
+
+    # pintu keluar: garis merah di tepi papan pada jalur mobil 'sh'
+    sh = state.cars['sh']
+    if sh.orientation == 'h':
+        x = board_width if state.exit == 'right' else 0
+        y = sh.row * cell_size + HEADER_HEIGHT
+        pygame.draw.line(screen, COLORS['sh'], (x, y), (x, y + cell_size), 6)
+    else:
+        x = sh.col * cell_size
+        y = HEADER_HEIGHT + (board_height if state.exit == 'bottom' else 0)
+        pygame.draw.line(screen, COLORS['sh'], (x, y), (x + cell_size, y), 6)
 
 
 def draw_state(state, info_text=None):
-    draw_background_grid()
+    draw_background_grid(state)
     for car in state.cars.values():
-        x = car.col * CELL_SIZE
-        y = car.row * CELL_SIZE + HEADER_HEIGHT
+        x = car.col * cell_size
+        y = car.row * cell_size + HEADER_HEIGHT
+        w = cell_size * (car.length if car.orientation == 'h' else 1)
+        h = cell_size * (car.length if car.orientation == 'v' else 1)
 
         key = ''
 
         if car.id == 'sh':
-            key = 'sh2'
+            key = f'sh{car.length}' if car.orientation == 'h' else ''
         elif car.id == 'b':
             key = 'b1'
         else:
@@ -66,15 +127,16 @@ def draw_state(state, info_text=None):
         image = car_images.get(key)
 
         if image:
+            if cell_size != CELL_SIZE:
+                image = pygame.transform.smoothscale(image, (w, h))
             screen.blit(image, (x, y))
         else:
-            w = CELL_SIZE * (car.length if car.orientation == 'h' else 1)
-            h = CELL_SIZE * (car.length if car.orientation == 'v' else 1)
-            pygame.draw.rect(screen, (200, 0, 200), pygame.Rect(x, y, w, h), border_radius=8)
+            color = COLORS['sh'] if car.id == 'sh' else (200, 0, 200)
+            pygame.draw.rect(screen, color, pygame.Rect(x, y, w, h), border_radius=8)
     
     if info_text:
         text_surface = font.render(info_text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(SCREEN_SIZE // 2, HEADER_HEIGHT // 2))
+        text_rect = text_surface.get_rect(center=(screen.get_width() // 2, HEADER_HEIGHT // 2))
         screen.blit(text_surface, text_rect)
     pygame.display.flip()
 
@@ -86,6 +148,7 @@ def draw_menu():
     astar_text = font.render("2. A* (Manhattan)", True, (0, 0, 0))
     ac3_text   = font.render("3. AC-3 + BFS",     True, (0, 0, 0))
     sa_text   = font.render("4. Simulated Annealing",     True, (0, 0, 0))
+    anytime_text = font.render("5. Anytime A*",     True, (0, 0, 0))
 
  
     title_pos = (50, 100)
@@ -93,11 +156,13 @@ def draw_menu():
     astar_pos = (50, 200)
     ac3_pos   = (50, 250) 
     sa_pos   = (50, 300) 
+    anytime_pos = (50, 350)
 
     bfs_rect = bfs_text.get_rect(topleft=bfs_pos)
     astar_rect = astar_text.get_rect(topleft=astar_pos)
     ac3_rect   = ac3_text.get_rect(topleft=ac3_pos)
     sa_rect   = sa_text.get_rect(topleft=sa_pos)
+    anytime_rect = anytime_text.get_rect(topleft=anytime_pos)
 
 
     screen.blit(title, title_pos)
@@ -105,6 +170,7 @@ def draw_menu():
     screen.blit(astar_text, astar_pos)
     screen.blit(ac3_text, ac3_pos)  
     screen.blit(sa_text, sa_pos)  
+    screen.blit(anytime_text, anytime_pos)
     pygame.display.flip()
 
     while True:
@@ -122,6 +188,8 @@ def draw_menu():
                     return 'ac3'
                 elif event.key == pygame.K_4:                      
                     return 'sa'
+                elif event.key == pygame.K_5:
+                    return 'anytime'
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # klik kiri
                 mouse_pos = event.pos
@@ -133,16 +201,38 @@ def draw_menu():
                     return 'ac3'
                 elif sa_rect.collidepoint(mouse_pos):
                     return 'sa'
-
-def keep_gui_alive():
-    """Pump event & redraw splash saat solver bekerja di thread lain."""
+                elif anytime_rect.collidepoint(mouse_pos):
+                    return 'anytime'
+
+def keep_gui_alive(state, job):
+    """
+    Pump event & gambar progress solver yang berjalan di proses lain.
+    Esc membatalkan solve; menutup window membatalkan lalu keluar.
+    Return True kalau SPACE ditekan saat solver anytime sudah punya
+    solusi sementara (animasi dimulai dengan solusi itu).
+    """
+    start_now = False
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            job.cancel(); job.wait()
             pygame.quit(); sys.exit()
-
-    loading = font.render("Solving...", True, (0,0,0))
-    screen.blit(loading, (300, 20))
-    pygame.display.flip()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            job.cancel()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            start_now = job.solution is not None
+
+    job.poll()
+    progress, solution = job.progress, job.solution
+    if solution is not None:
+        text = (f"Langkah: {solution['moves']} (<= {solution['bound']:.2f}x optimal)"
+                f" | SPACE mulai")
+    elif progress is None:
+        text = f"Solving... {job.elapsed():.1f}s (Esc batal)"
+    else:
+        text = (f"Solving... {job.elapsed():.1f}s | depth {progress['depth']}"
+                f" | {progress['expanded']} node (Esc batal)")
+    draw_state(state, text)
+    return start_now
 
 def draw_dataset_menu(dataset_files):
     screen.fill((255, 255, 255))
@@ -174,6 +264,7 @@ def draw_dataset_menu(dataset_files):
 def main():
 
 
+    init_display()
     dataset_folder = r'dataaset'
     dataset_files  = [f for f in os.listdir(dataset_folder) if f.endswith('.csv')]
 
@@ -183,54 +274,55 @@ def main():
     state    = RushHourState.from_csv(csv_path)
 
     algo = draw_menu()          
+    set_board(state)
 
-    solution = []
-    solving = True
     start_time = time.time()
+    cache = SolutionCache()
+    name, cache_key, options = ALGORITHMS[algo]
+    solution = cache.get(cache_key, state) if cache_key else None
+    status = 'cached'
+    waiting = True
 
-    def run_solver():
-        nonlocal solution, solving
-        if algo == 'bfs':
-            solution = bfs(state)
-        elif algo == 'astar':
-            goal_pos = (state.cars['sh'].row, 5)
-            sol_states, _ = a_star(
-                state,
-                lambda s: s.is_goal(),
-                get_neighbors_astar,
-                heuristic_manhattan,
-                goal_pos
-            )
-            solution = [
-                (s.move[0], s.move[1])
-                for s in sol_states[1:] if hasattr(s, 'move')
-            ]
-        elif algo == 'ac3':
-            solution = ac3_bfs(state, )
-        elif algo == 'sa':
-            solution = simulated_annealing_solver(state, max_iter=MAX_ITER, start_temp=START_TEMP, cooling_rate=COOLING_RATE)
-        solving = False
-
-    threading.Thread(target=run_solver, daemon=True).start()
-
-  
-    while solving:
-        keep_gui_alive()
-        time.sleep(0.05)
+    if solution is None:
+        job = SolveJob(name, state, TIME_LIMIT, MAX_EXPANDED, profile=PROFILE, **options).start()
+        while not job.done:
+            if keep_gui_alive(state, job):
+                # solusi anytime sementara cukup; sisa search dihentikan
+                job.cancel()
+                job.wait()
+                waiting = False
+            time.sleep(0.05)
+        result = job.result
+        status, solution = result['status'], result['path'] or []
+        if cache_key and status == 'solved':
+            cache.put(cache_key, state, solution)
+        if algo == 'sa' and solution and SHORTEN:
+            before = len(solution)
+            solution = shorten(state, solution)
+            print(f"Path dipendekkan: {before} -> {len(solution)} langkah")
+        print('  '.join(f"{k}={result.get(k)}" for k in ('status', 'depth', 'expanded', 'generated', 'frontier_peak')))
+        if result.get('error'):
+            print(result['error'])
+        if result.get('report'):
+            print(result['report'])
 
     elapsed_time = time.time() - start_time
-    step_count = len(solution) if solution else 0
+    step_count = len(solution)
 
     info_string = f"{algo.upper()} | Langkah: {step_count} | Waktu: {elapsed_time:.2f}s"
+    if status not in ('solved', 'cached'):
+        info_string = f"{algo.upper()} | {status} | Waktu: {elapsed_time:.2f}s"
+        if solution:
+            info_string = f"{algo.upper()} | Langkah: {step_count} ({status}) | Waktu: {elapsed_time:.2f}s"
     draw_state(state, info_string)
     print(f"Algoritma: {algo.upper()} | Langkah = {step_count} | Waktu = {elapsed_time:.2f} detik")
+    print(cache.report())
 
     pygame.display.flip()
 
-    print("Tekan SPACE untuk mulai animasi.")
-
+    if waiting:
+        print("Tekan SPACE untuk mulai animasi.")
 
-    waiting = True
     while waiting:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
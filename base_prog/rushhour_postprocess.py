@@ -0,0 +1,190 @@
+"""
+Post-processing path solusi yang tidak optimal (simulated annealing,
+ac3_dfs): path dipendekkan tanpa mengubah state akhirnya.
+
+1. remove_cycles    : state yang dikunjungi ulang -> potong loop di antaranya
+2. cancel_inverses  : pasangan langkah mobil yang sama yang saling membatalkan
+                      (mis. v1 +1 ... v1 -1) dibuang kalau langkah di
+                      antaranya tetap legal tanpa keduanya
+3. resolve_windows  : (opsional) tiap jendela `window` langkah diganti path
+                      terpendek antar ujungnya (BFS terbatas)
+4. merge_slides     : (opsional) geser berurutan mobil yang sama digabung
+                      jadi satu langkah makro (car_id, total delta)
+
+    python rushhour_postprocess.py dataaset/game3.csv --algorithm ac3_dfs --window 8
+"""
+import argparse
+import sys
+
+from rushhour_state import RushHourState
+from rushhour_search import as_compact, get_neighbors, reconstruct_path, SOLVERS
+
+
+def replay(state, path):
+    """List state [awal, sesudah langkah 1, …]; ValueError kalau ada langkah ilegal."""
+    st = as_compact(state)
+    states = [st]
+    for cid, delta in path:
+        st = st.slide(st.board.index[cid], delta)
+        if st is None:
+            raise ValueError(f"langkah ilegal ({cid}, {delta}) di posisi {len(states) - 1}")
+        states.append(st)
+    return states
+
+
+def remove_cycles(state, path):
+    """Setiap kali state muncul lagi, langkah sejak kemunculan pertamanya dibuang."""
+    st = as_compact(state)
+    index = {st.key(): 0}
+    out = []
+    for cid, delta in path:
+        st = st.slide(st.board.index[cid], delta)
+        seen = index.get(st.key())
+        if seen is not None:
+            for old in out[seen:]:
+                index.pop(old[0], None)
+            del out[seen:]
+            continue
+        out.append((st.key(), (cid, delta)))
+        index[st.key()] = len(out)
+    return [move for _, move in out]
+
+
+def cancel_inverses(state, path):
+    """
+    Untuk tiap langkah (c, d), cari langkah terakhir mobil c sebelumnya;
+    kalau itu (c, -d) dan semua langkah di antaranya tetap legal dengan c
+    di posisi lamanya, keduanya dibuang. Posisi akhir semua mobil sama.
+    """
+    states = replay(state, [])
+    out = []
+    for cid, delta in path:
+        j = next((k for k in range(len(out) - 1, -1, -1) if out[k][0] == cid), None)
+        if j is not None and out[j][1] == -delta:
+            st, replayed = states[j], [states[j]]
+            for c, d in out[j + 1:]:
+                st = st.slide(st.board.index[c], d)
+                if st is None:
+                    break
+                replayed.append(st)
+            else:
+                del out[j]
+                states[j:] = replayed
+                continue
+        st = states[-1].slide(states[-1].board.index[cid], delta)
+        out.append((cid, delta))
+        states.append(st)
+    return out
+
+
+def _shortest_between(start, target, limit):
+    """Path terpendek start -> target dengan paling banyak `limit` langkah, atau None."""
+    goal = target.key()
+    if start.key() == goal:
+        return []
+    parents = {start.key(): None}
+    layer = [start]
+    for _ in range(limit):
+        next_layer = []
+        for st in layer:
+            key = st.key()
+            for nxt, move_info in get_neighbors(st):
+                next_key = nxt.key()
+                if next_key in parents:
+                    continue
+                parents[next_key] = (key, move_info)
+                if next_key == goal:
+                    return reconstruct_path(parents, goal)
+                next_layer.append(nxt)
+        layer = next_layer
+    return None
+
+
+def resolve_windows(state, path, window=8):
+    """
+    Geser jendela `window` langkah sepanjang path; kalau BFS menemukan path
+    lebih pendek antara kedua ujung jendela, jendela diganti dan dicek lagi
+    dari posisi yang sama.
+    """
+    path = list(path)
+    states = replay(state, path)
+    i = 0
+    while i < len(path) - 1:
+        j = min(i + window, len(path))
+        shorter = _shortest_between(states[i], states[j], j - i - 1)
+        if shorter is None:
+            i += 1
+            continue
+        path[i:j] = shorter
+        states[i:] = replay(states[i], path[i:])
+    return path
+
+
+def split_slides(path):
+    """Langkah makro (car_id, delta) dipecah jadi |delta| geser satu sel."""
+    out = []
+    for cid, delta in path:
+        step = 1 if delta > 0 else -1
+        out.extend([(cid, step)] * abs(delta))
+    return out
+
+
+def merge_slides(path):
+    """Geser berurutan mobil yang sama digabung; total delta 0 dibuang."""
+    out = []
+    for cid, delta in path:
+        if out and out[-1][0] == cid:
+            delta += out.pop()[1]
+            if not delta:
+                continue
+        out.append((cid, delta))
+    return out
+
+
+def shorten(state, path, window=0, merge=False, report=None):
+    """
+    remove_cycles + cancel_inverses sampai tidak ada perubahan, lalu
+    resolve_windows (window > 0) dan merge_slides (merge=True). Kalau
+    `report` berupa list, panjang path sesudah tiap tahap ditambahkan
+    sebagai (nama tahap, panjang). Langkah makro (bfs_macro, a_star_macro)
+    dipecah dulu jadi geser satu sel (split_slides): cancel_inverses hanya
+    benar untuk geser satu sel, dan semua panjang dihitung dalam geser itu.
+    """
+    def note(stage, result):
+        if report is not None:
+            report.append((stage, len(result)))
+        return result
+
+    path = note('awal', split_slides(path))
+    while True:
+        before = len(path)
+        path = note('cycles', remove_cycles(state, path))
+        path = note('inverses', cancel_inverses(state, path))
+        if len(path) == before:
+            break
+    if window > 0:
+        path = note('windows', resolve_windows(state, path, window))
+    if merge:
+        path = note('merge', merge_slides(path))
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv')
+    parser.add_argument('--algorithm', default='ac3_dfs', choices=sorted(SOLVERS))
+    parser.add_argument('--window', type=int, default=0)
+    parser.add_argument('--merge', action='store_true')
+    args = parser.parse_args()
+
+    state = RushHourState.from_csv(args.csv)
+    path = SOLVERS[args.algorithm](state)
+    if path is None:
+        sys.exit(f"{args.algorithm} tidak menemukan solusi")
+    report = []
+    short = shorten(state, path, args.window, args.merge, report)
+    assert replay(state, short)[-1].is_goal()
+    for stage, length in report:
+        print(f"{stage:<10}{length:>7}")
+    print(f"{report[0][1]} -> {len(short)} langkah")
@@ -0,0 +1,285 @@
+"""
+Menjalankan solver rushhour_search di proses terpisah dengan progress,
+pembatalan, dan budget (waktu / jumlah node).
+
+Solver di proses worker diberi ProgressStats: setiap `every` ekspansi ia
+mengirim event progress (depth, expanded, generated, frontier_peak, waktu)
+lewat Pipe ke proses pemanggil, lalu memeriksa flag batal dan budget; kalau
+salah satunya kena, search dihentikan dengan SolveAborted dari dalam
+loop solver itu sendiri. Solver anytime (ANYTIME_SOLVERS) juga mengirim
+event 'solution' tiap kali path-nya membaik; kalau search dihentikan,
+path terbaik terakhir tetap menjadi hasil. Counter harus dinaikkan selama
+search berjalan, bukan ditotal sesudahnya: tick sesudah search selesai
+akan membuang hasilnya. Solver yang jarang menaikkan `expanded` (mis.
+simulated_annealing dengan workers > 1, yang menambahkannya per run)
+dihentikan paksa (terminate) kalau tidak berhenti dalam `grace` detik.
+
+    job = SolveJob('a_star', state, time_limit=30, heuristic='blocking')
+    job.start()
+    while not job.done:
+        for event in job.poll():
+            ...                      # event['event'] == 'progress' / 'solution' / 'done'
+    job.result                       # dict event 'done'
+
+    python rushhour_runner.py dataaset/game3.csv --algorithm bfs --max-expanded 20000
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+from rushhour_state import RushHourState
+from rushhour_search import ANYTIME_SOLVERS, SOLVERS, SearchStats
+
+# status akhir di event 'done'
+STATUSES = ('solved', 'unsolved', 'cancelled', 'timeout', 'budget', 'error')
+
+
+class SolveAborted(Exception):
+    """Dilempar ProgressStats untuk menghentikan solver; args[0] = status."""
+
+
+class ProgressStats(SearchStats):
+    """
+    SearchStats yang `expanded`-nya berupa property: tiap kali nilainya
+    melewati kelipatan `every`, tick() dipanggil (kirim progress, cek
+    pembatalan dan budget). Solver tidak perlu tahu apa-apa; biaya
+    tambahannya satu pemanggilan setter per ekspansi.
+    """
+    __slots__ = ('_expanded', '_next_tick', 'every', 'send', 'cancel',
+                 'deadline', 'max_expanded', 'started')
+
+    def __init__(self, send=None, cancel=None, time_limit=None, max_expanded=None,
+                 every=1000, profile=False):
+        self._next_tick = every
+        self.every = every
+        self.send = send
+        self.cancel = cancel
+        self.started = time.perf_counter()
+        self.deadline = None if time_limit is None else self.started + time_limit
+        self.max_expanded = max_expanded
+        super().__init__(profile)
+
+    @property
+    def expanded(self):
+        return self._expanded
+
+    @expanded.setter
+    def expanded(self, value):
+        self._expanded = value
+        if value >= self._next_tick:
+            self._next_tick = value + self.every
+            self.tick()
+
+    def progress(self):
+        return {'event': 'progress', 'depth': self.depth, **self.as_dict(),
+                'elapsed': round(time.perf_counter() - self.started, 3)}
+
+    def tick(self):
+        if self.send is not None:
+            self.send(self.progress())
+        if self.cancel is not None and self.cancel.is_set():
+            raise SolveAborted('cancelled')
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolveAborted('timeout')
+        if self.max_expanded is not None and self._expanded >= self.max_expanded:
+            raise SolveAborted('budget')
+
+
+def solve(algorithm, state, send=None, cancel=None, time_limit=None, max_expanded=None,
+          every=1000, profile=False, **kwargs):
+    """
+    Jalankan SOLVERS[algorithm](state, stats=..., **kwargs) di proses ini
+    dengan ProgressStats. Return dict event 'done': status (STATUSES),
+    path, moves, time_s, depth, counter SearchStats, dan report kalau
+    profile=True. Untuk solver anytime yang dihentikan, path = path
+    terbaik sejauh ini dan bound-nya ikut dilaporkan.
+    """
+    stats = ProgressStats(send, cancel, time_limit, max_expanded, every, profile)
+    path, error, best = None, None, {}
+
+    def on_solution(path, bound):
+        best.update(path=path, bound=bound)
+        if send is not None:
+            send({'event': 'solution', 'path': path, 'moves': len(path), 'bound': bound,
+                  'elapsed': round(time.perf_counter() - stats.started, 3)})
+
+    if algorithm in ANYTIME_SOLVERS:
+        kwargs['on_solution'] = on_solution
+    try:
+        path = SOLVERS[algorithm](state, stats=stats, **kwargs)
+        status = 'solved' if path is not None else 'unsolved'
+    except SolveAborted as e:
+        status = e.args[0]
+        path = best.get('path')
+    except Exception as e:
+        status, error = 'error', repr(e)
+    result = stats.progress()
+    result.update(event='done', status=status, path=path,
+                  moves=len(path) if path is not None else None,
+                  time_s=result.pop('elapsed'), error=error)
+    if 'bound' in best:
+        result['bound'] = best['bound'] if status != 'solved' else 1.0
+    if profile:
+        result['report'] = stats.report()
+    return result
+
+
+def _worker(conn, cancel, algorithm, state, options):
+    """Target proses worker: semua event dikirim lewat `conn`."""
+    # print dari solver jangan sampai tercampur dengan output pemanggil
+    sys.stdout = sys.stderr
+    try:
+        conn.send(solve(algorithm, state, conn.send, cancel, **options))
+    except (BrokenPipeError, EOFError):
+        pass    # pemanggil sudah pergi
+    finally:
+        conn.close()
+
+
+class SolveJob:
+    """
+    Satu solve di proses terpisah. poll() tidak pernah blocking, jadi aman
+    dipanggil dari event loop GUI; `progress` dan `solution` menyimpan event
+    progress / solution terakhir dan `result` event 'done' (None selama
+    masih berjalan).
+
+    time_limit (detik) dan max_expanded dicek di dalam solver; time_limit
+    juga ditegakkan dari luar: proses yang masih hidup `grace` detik
+    sesudahnya dimatikan dengan status 'timeout'.
+    """
+
+    def __init__(self, algorithm, state, time_limit=None, max_expanded=None, every=1000,
+                 profile=False, grace=1.0, **kwargs):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"algoritma tidak dikenal: {algorithm!r}")
+        self.algorithm = algorithm
+        self.state = state
+        self.time_limit = time_limit
+        self.grace = grace
+        self.options = dict(kwargs, time_limit=time_limit, max_expanded=max_expanded,
+                            every=every, profile=profile)
+        self.progress = None
+        self.solution = None
+        self.result = None
+        self._proc = None
+        self._conn = None
+        self._cancel = None
+        self._kill_at = None
+        self._forced_status = 'timeout'
+        self._started = None
+
+    def start(self):
+        ctx = multiprocessing.get_context()
+        recv, send = ctx.Pipe(duplex=False)
+        self._cancel = ctx.Event()
+        # bukan daemon: simulated_annealing dengan workers > 1 membuat proses anak
+        self._proc = ctx.Process(target=_worker,
+                                 args=(send, self._cancel, self.algorithm, self.state,
+                                       self.options))
+        self._started = time.monotonic()
+        self._proc.start()
+        send.close()
+        self._conn = recv
+        if self.time_limit is not None:
+            self._kill_at = self._started + self.time_limit + self.grace
+        return self
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def elapsed(self):
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    def poll(self):
+        """Ambil semua event yang sudah masuk (list, mungkin kosong)."""
+        events = []
+        if self.done or self._conn is None:
+            return events
+        try:
+            while self._conn.poll():
+                event = self._conn.recv()
+                events.append(event)
+                if event['event'] == 'progress':
+                    self.progress = event
+                elif event['event'] == 'solution':
+                    self.solution = event
+                else:
+                    self._finish(event)
+                    return events
+        except EOFError:
+            self._proc.join()
+            events.append(self._finish_forced('error',
+                                              f"worker exit code {self._proc.exitcode}"))
+            return events
+        if self._kill_at is not None and time.monotonic() > self._kill_at:
+            events.append(self._finish_forced(self._forced_status))
+        return events
+
+    def cancel(self):
+        """Minta solver berhenti; dimatikan paksa kalau masih jalan sesudah `grace` detik."""
+        if self.done or self._cancel is None:
+            return
+        self._cancel.set()
+        self._forced_status = 'cancelled'
+        kill_at = time.monotonic() + self.grace
+        self._kill_at = kill_at if self._kill_at is None else min(self._kill_at, kill_at)
+
+    def wait(self, interval=0.05):
+        """Blocking sampai selesai; return event 'done'."""
+        while not self.done:
+            self.poll()
+            if not self.done:
+                self._conn.poll(interval)
+        return self.result
+
+    def _finish(self, event):
+        self.result = event
+        self._conn.close()
+        self._proc.join()
+
+    def _finish_forced(self, status, error=None):
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._proc.join()
+        last = self.progress or {}
+        event = {'event': 'done', 'status': status, 'path': None, 'moves': None,
+                 'time_s': round(self.elapsed(), 3), 'error': error,
+                 **{k: v for k, v in last.items() if k not in ('event', 'elapsed')}}
+        if self.solution is not None:
+            event.update(path=self.solution['path'], moves=self.solution['moves'],
+                         bound=self.solution['bound'])
+        self.result = event
+        self._conn.close()
+        return event
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv')
+    parser.add_argument('--algorithm', default='bfs', choices=sorted(SOLVERS))
+    parser.add_argument('--time-limit', type=float, help="detik")
+    parser.add_argument('--max-expanded', type=int)
+    parser.add_argument('--every', type=int, default=1000, help="ekspansi per event progress")
+    args = parser.parse_args()
+
+    job = SolveJob(args.algorithm, RushHourState.from_csv(args.csv), args.time_limit,
+                   args.max_expanded, args.every).start()
+    try:
+        while not job.done:
+            for event in job.poll():
+                if event['event'] == 'progress':
+                    print(f"{event['elapsed']:>8.2f}s  depth {event['depth']:>4}"
+                          f"  expanded {event['expanded']:>9}  frontier_peak {event['frontier_peak']:>8}")
+                elif event['event'] == 'solution':
+                    print(f"{event['elapsed']:>8.2f}s  solusi {event['moves']} langkah"
+                          f" (<= {event['bound']:.2f} x optimal)")
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+    result = job.result
+    print(f"{result['status']}: {result['moves']} langkah, {result.get('expanded')} expanded,"
+          f" {result['time_s']}s" + (f" ({result['error']})" if result['error'] else ''))
@@ -1,31 +1,440 @@
-from collections import deque
+from array import array
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from multiprocessing import resource_tracker, shared_memory
+import functools
 import itertools
 import heapq
 import math 
+import multiprocessing
+import os
+import random
+from time import perf_counter
+from rushhour_state import RushHourState, CompactState
+
+def as_compact(state):
+    """Search on the bitboard form; RushHourState is converted once here."""
+    return state if isinstance(state, CompactState) else state.to_compact()
 
-def bfs(initial_state):
-    visited = set()
-    queue = deque([(initial_state, [])]) 
+def reconstruct_path(parents, key):
+    """
+    Walk a parent table {key: (parent_key, move)} back from `key` to the
+    root (whose entry is None) and return the moves in order.
+    """
+    path = []
+    while parents[key] is not None:
+        key, move = parents[key]
+        path.append(move)
+    path.reverse()
+    return path
+
+class SearchStats:
+    """
+    Counters a solver fills in when it is given one (stats=SearchStats()).
+    Solvers only touch it behind `if stats is not None`.
+
+    With profile=True the solver also times its phases: 'neighbors'
+    (generation), 'heuristic', 'hashing' and 'visited' (visited/parent
+    table lookups), 'frontier' (deque/stack/heap operations) and, in
+    ac3_dfs, 'domains'/'constraints' (domain copies, forward checking or
+    MAC propagation). `pruned` counts children cut by those checks. The
+    timing wrappers are chosen once when the solver starts, so the loop
+    runs the plain functions and containers when profiling is off.
+
+    `depth` is not a counter but the solver's current depth: g of the node
+    being expanded (a_star_moves), the BFS layer, the DFS path length
+    (MAC), the depth limit (iddfs) or the f bound (ida_star). Solvers that
+    cannot tell leave it at 0.
+    """
+    COUNTERS = ('expanded', 'generated', 'duplicates', 'frontier_peak', 'pruned')
+    __slots__ = COUNTERS + ('depth', 'profile', 'timings', 'calls')
+
+    def __init__(self, profile=False):
+        self.depth = 0
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.frontier_peak = 0
+        self.pruned = 0
+        self.profile = profile
+        self.timings = {}
+        self.calls = {}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def add(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def timed(self, phase, fn):
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.add(phase, perf_counter() - start)
+        return wrapper
+
+    def report(self):
+        lines = ['  '.join(f"{name}={getattr(self, name)}" for name in self.COUNTERS)]
+        if self.timings:
+            lines.append(f"{'phase':<10}{'calls':>10}{'total ms':>11}{'us/call':>9}")
+            for phase, seconds in sorted(self.timings.items(), key=lambda kv: -kv[1]):
+                calls = self.calls[phase]
+                lines.append(f"{phase:<10}{calls:>10}{seconds * 1e3:>11.1f}{seconds / calls * 1e6:>9.2f}")
+        return '\n'.join(lines)
+
+class _TimedDict(dict):
+    """
+    Visited/parent table for profiling. hash(key) is timed separately as
+    'hashing'; the lookup itself (which hashes again inside dict) is 'visited'.
+    """
+
+    def __init__(self, stats):
+        super().__init__()
+        self._stats = stats
+
+    def _hash(self, key):
+        start = perf_counter()
+        hash(key)
+        self._stats.add('hashing', perf_counter() - start)
+
+    def __contains__(self, key):
+        self._hash(key)
+        start = perf_counter()
+        found = dict.__contains__(self, key)
+        self._stats.add('visited', perf_counter() - start)
+        return found
+
+    def __getitem__(self, key):
+        self._hash(key)
+        start = perf_counter()
+        try:
+            return dict.__getitem__(self, key)
+        finally:
+            self._stats.add('visited', perf_counter() - start)
+
+    def __setitem__(self, key, value):
+        self._hash(key)
+        start = perf_counter()
+        dict.__setitem__(self, key, value)
+        self._stats.add('visited', perf_counter() - start)
+
+    def get(self, key, default=None):
+        self._hash(key)
+        start = perf_counter()
+        value = dict.get(self, key, default)
+        self._stats.add('visited', perf_counter() - start)
+        return value
+
+class _TimedSet(set):
+
+    def __init__(self, stats):
+        super().__init__()
+        self._stats = stats
+
+    def __contains__(self, key):
+        start = perf_counter()
+        found = set.__contains__(self, key)
+        self._stats.add('visited', perf_counter() - start)
+        return found
+
+    def add(self, key):
+        start = perf_counter()
+        set.add(self, key)
+        self._stats.add('visited', perf_counter() - start)
+
+    def remove(self, key):
+        start = perf_counter()
+        set.remove(self, key)
+        self._stats.add('visited', perf_counter() - start)
+
+    def discard(self, key):
+        start = perf_counter()
+        set.discard(self, key)
+        self._stats.add('visited', perf_counter() - start)
+
+class _TimedDeque(deque):
+
+    def __init__(self, stats, items):
+        super().__init__(items)
+        self._stats = stats
+
+    def append(self, item):
+        start = perf_counter()
+        deque.append(self, item)
+        self._stats.add('frontier', perf_counter() - start)
+
+    def popleft(self):
+        start = perf_counter()
+        try:
+            return deque.popleft(self)
+        finally:
+            self._stats.add('frontier', perf_counter() - start)
+
+    def pop(self):
+        start = perf_counter()
+        try:
+            return deque.pop(self)
+        finally:
+            self._stats.add('frontier', perf_counter() - start)
+
+def _profiling(stats):
+    return stats is not None and stats.profile
+
+def _table(stats):
+    return _TimedDict(stats) if _profiling(stats) else {}
+
+def _set(stats):
+    return _TimedSet(stats) if _profiling(stats) else set()
+
+def _queue(stats, items):
+    """deque untuk BFS (popleft) maupun stack DFS (pop)."""
+    return _TimedDeque(stats, items) if _profiling(stats) else deque(items)
+
+def _timed(stats, phase, fn):
+    return stats.timed(phase, fn) if _profiling(stats) else fn
+
+def bfs(initial_state, on_generate=True, stats=None, moves='unit'):
+    """
+    BFS optimal (jumlah langkah minimum).
+    on_generate=True  : tandai visited dan cek goal saat tetangga dibuat,
+                        jadi antrian tidak berisi duplikat dan pencarian
+                        berhenti satu layer lebih awal.
+    on_generate=False : cara lama, cek visited/goal saat state di-pop.
+    moves: model langkah di MOVE_MODELS ('unit' atau 'macro'; model
+    berbobot hanya untuk a_star_moves).
+    """
+    start = as_compact(initial_state)
+    expand = _timed(stats, 'neighbors', _move_model(moves)[0])
+    if on_generate:
+        return _bfs_on_generate(start, stats, expand)
+    return _bfs_on_pop(start, stats, expand)
+
+def _bfs_on_pop(start, stats, expand):
+    parents = _table(stats)
+    queue = _queue(stats, [(start, None, None)]) 
 
     while queue:
-        state, path = queue.popleft()
-        state_key = tuple((c.id, c.row, c.col) for c in state.cars.values())
+        state, parent_key, move_info = queue.popleft()
+        state_key = state.key()
 
-        if state_key in visited:
+        if state_key in parents:
+            if stats is not None:
+                stats.duplicates += 1
             continue
-        visited.add(state_key)
+        parents[state_key] = None if parent_key is None else (parent_key, move_info)
 
         if state.is_goal():
-            return path
+            return reconstruct_path(parents, state_key)
+
+        neighbors = expand(state)
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+            stats.frontier_peak = max(stats.frontier_peak, len(queue) + len(neighbors))
+        for next_state, move_info in neighbors:
+            queue.append((next_state, state_key, move_info))
+
+    return None 
+
+def _bfs_on_generate(start, stats, expand):
+    if start.is_goal():
+        return []
+    parents = _table(stats)
+    parents[start.key()] = None
+    queue = _queue(stats, [start])
+    layer_left = 1     # sisa state di layer stats.depth yang belum diekspansi
 
-        for move in get_neighbors(state):
-            next_state, move_info = move
-            queue.append((next_state, path + [move_info]))
+    while queue:
+        state = queue.popleft()
+        state_key = state.key()
+
+        neighbors = expand(state)
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+        for next_state, move_info in neighbors:
+            next_key = next_state.key()
+            if next_key in parents:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            parents[next_key] = (state_key, move_info)
+            if next_state.is_goal():
+                return reconstruct_path(parents, next_key)
+            queue.append(next_state)
+        if stats is not None:
+            stats.frontier_peak = max(stats.frontier_peak, len(queue))
+            layer_left -= 1
+            if not layer_left:
+                stats.depth += 1
+                layer_left = len(queue)
 
     return None 
 
+def goal_configurations(state, limit=None):
+    """
+    Semua konfigurasi goal yang konsisten dengan mobil di `state`: mobil
+    'sh' di pintu keluar (board.goal), mobil lain di posisi legal pada
+    jalurnya tanpa tabrakan, dan urutan mobil dalam satu baris/kolom tetap
+    sama seperti di `state` (mobil tidak bisa saling melewati).
+    Jumlahnya bisa meledak di papan besar yang longgar; kalau lebih dari
+    `limit`, enumerasi dihentikan dan return None.
+    """
+    state = as_compact(state)
+    board = state.board
+    n = len(state.heads)
+    goal_heads = list(state.heads)
+    goal_heads[board.red] = board.goal
+
+    def coord(i, head, axis):
+        r, c = board.cell(i, head)
+        return c if axis == 'row' else r
+
+    # pasangan (a, b, axis): a harus tetap sebelum b di sepanjang axis
+    lanes = {}
+    for i in range(n):
+        r, c = board.cell(i, state.heads[i])
+        if board.orientations[i] != 'v':
+            lanes.setdefault(('row', r), []).append(i)
+        if board.orientations[i] != 'h':
+            lanes.setdefault(('col', c), []).append(i)
+    constraints = [[] for _ in range(n)]
+    for (axis, _), cars in lanes.items():
+        cars.sort(key=lambda i: coord(i, state.heads[i], axis))
+        for a, b in zip(cars, cars[1:]):
+            constraints[a].append((a, b, axis))
+            constraints[b].append((a, b, axis))
+
+    fixed = [i for i in range(n) if i == board.red or not board.movable[i]]
+    free = sorted((i for i in range(n) if i not in fixed),
+                  key=lambda i: (board.orientations[i], board.lines[i], state.heads[i]))
+    placed = [i in fixed for i in range(n)]
+    occ = 0
+    for i in fixed:
+        occ |= board.masks[i][goal_heads[i]]
+
+    def ordered(i):
+        for a, b, axis in constraints[i]:
+            if placed[a] and placed[b] and \
+                    coord(a, goal_heads[a], axis) >= coord(b, goal_heads[b], axis):
+                return False
+        return True
+
+    if not all(ordered(i) for i in fixed):
+        return []
+
+    goals = []
+    if limit is None:
+        limit = math.inf
+
+    def place(k, occ):
+        if len(goals) > limit:
+            return
+        if k == len(free):
+            goals.append(CompactState(board, tuple(goal_heads), occ))
+            return
+        i = free[k]
+        placed[i] = True
+        for head, mask in enumerate(board.masks[i]):
+            if occ & mask:
+                continue
+            goal_heads[i] = head
+            if ordered(i):
+                place(k + 1, occ | mask)
+        placed[i] = False
+
+    place(0, occ)
+    return goals if len(goals) <= limit else None
+
+def bidirectional_bfs(initial_state, stats=None, moves='unit', max_goals=20000):
+    """
+    BFS dua arah: maju dari state awal, mundur dari semua konfigurasi goal
+    (goal_configurations), layer demi layer pada sisi yang frontier-nya
+    lebih kecil. Langkah Rush Hour reversible, jadi tetangga mundur sama
+    dengan tetangga maju (juga untuk moves='macro'). Kalau konfigurasi
+    goal lebih dari `max_goals` (papan besar dengan banyak ruang kosong),
+    sisi mundur tidak sebanding biayanya dan dipakai BFS maju biasa.
+    Return path optimal [(car_id, delta), …] atau None.
+    """
+    start = as_compact(initial_state)
+    if start.is_goal():
+        return []
+    expand = _timed(stats, 'neighbors', _move_model(moves)[0])
+    goals = goal_configurations(start, max_goals)
+    if goals is None:
+        return _bfs_on_generate(start, stats, expand)
+    if stats is not None:
+        stats.generated += len(goals)
+    forward = _table(stats)
+    forward[start.key()] = None
+    backward = _table(stats)
+    for g in goals:
+        backward[g.key()] = None
+    if start.key() in backward:
+        return []
+    f_layer, b_layer = [start], goals
+
+    while f_layer and b_layer:
+        expand_forward = len(f_layer) <= len(b_layer)
+        if expand_forward:
+            layer, seen, other = f_layer, forward, backward
+        else:
+            layer, seen, other = b_layer, backward, forward
+
+        next_layer = []
+        meet, best = None, None
+        for state in layer:
+            key = state.key()
+            neighbors = expand(state)
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(neighbors)
+            for next_state, move_info in neighbors:
+                next_key = next_state.key()
+                if next_key in seen:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                seen[next_key] = (key, move_info)
+                next_layer.append(next_state)
+                if next_key in other:
+                    length = _depth(forward, next_key) + _depth(backward, next_key)
+                    if best is None or length < best:
+                        meet, best = next_key, length
+
+        # layer diselesaikan dulu supaya pertemuan terpendek yang diambil
+        if meet is not None:
+            path = reconstruct_path(forward, meet)
+            key = meet
+            while backward[key] is not None:
+                key, (cid, delta) = backward[key]
+                path.append((cid, -delta))
+            return path
+
+        if expand_forward:
+            f_layer = next_layer
+        else:
+            b_layer = next_layer
+        if stats is not None:
+            stats.frontier_peak = max(stats.frontier_peak, len(f_layer) + len(b_layer))
+            stats.depth += 1
+
+    return None
+
+def _depth(parents, key):
+    depth = 0
+    while parents[key] is not None:
+        key = parents[key][0]
+        depth += 1
+    return depth
+
 def get_neighbors(state):
+    if isinstance(state, CompactState):
+        return state.neighbors()
     neighbors = []
     for car in state.cars.values():
         if not car.movable:
@@ -39,33 +448,49 @@ def get_neighbors(state):
 
 def move_car(car, delta, state):
 
+    grid = state.grid()
     if car.orientation == 'h':
         new_col = car.col + delta
-        new_tail = new_col + car.length - 1
-        if 0 <= new_col <= state.grid_size - car.length:
-    
-            positions = state.occupied() - set(car.positions())
+        if 0 <= new_col <= state.cols - car.length:
             for i in range(car.length):
-                pos = (car.row, new_col + i)
-                if pos in positions:
+                if grid[car.row][new_col + i] not in (None, car.id):
                     return False
-            car.col = new_col
+            state.place_car(car, car.row, new_col)
             return True
 
     elif car.orientation == 'v':
         new_row = car.row + delta
-        new_tail = new_row + car.length - 1
-        if 0 <= new_row <= state.grid_size - car.length:
-            positions = state.occupied() - set(car.positions())
+        if 0 <= new_row <= state.rows - car.length:
             for i in range(car.length):
-                pos = (new_row + i, car.col)
-                if pos in positions:
+                if grid[new_row + i][car.col] not in (None, car.id):
                     return False
-            car.row = new_row
+            state.place_car(car, new_row, car.col)
             return True
     return False
 
-def a_star(start, is_goal, get_neighbors, heuristic, goal):
+def _on_board(heuristic, start):
+    """
+    Heuristik di HEURISTICS bekerja di CompactState. Untuk RushHourState,
+    Board dibangun sekali dari `start` dan dipakai ulang tiap pemanggilan
+    (as_compact membangun Board baru, jadi board.cache pattern_db hilang).
+    """
+    if isinstance(start, CompactState):
+        return heuristic
+    board = start.to_compact().board
+
+    def on_board(state, goal):
+        heads = tuple(car.row if car.orientation == 'v' else car.col
+                      for car in state.cars.values())
+        return heuristic(CompactState(board, heads), goal)
+    return on_board
+
+def a_star(start, is_goal, get_neighbors, heuristic, goal, stats=None):
+    """
+    `heuristic` boleh berupa fungsi (state, goal) atau nama di HEURISTICS,
+    mis. a_star(s, is_goal, get_neighbors_astar, 'blocking', None).
+    """
+    if isinstance(heuristic, str):
+        heuristic = _on_board(get_heuristic(heuristic), start)
     counter = itertools.count()  
     heap = [(heuristic(start, goal), next(counter), start)] 
     came_from = {}
@@ -83,7 +508,12 @@ def a_star(start, is_goal, get_neighbors, heuristic, goal):
             path.reverse()
             return path, cost
 
-        for neighbor, move_cost in get_neighbors(current):
+        neighbors = get_neighbors(current)
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+            stats.frontier_peak = max(stats.frontier_peak, len(heap) + len(neighbors))
+        for neighbor, move_cost in neighbors:
             new_cost = cost[current] + move_cost
             if neighbor not in cost or new_cost < cost[neighbor]:
                 cost[neighbor] = new_cost
@@ -93,17 +523,377 @@ def a_star(start, is_goal, get_neighbors, heuristic, goal):
 
     return [], cost
 
+def a_star_moves(initial_state, heuristic='manhattan', stats=None, moves='unit'):
+    """
+    A* di atas CompactState: g-cost dan parent disimpan per key() (integer),
+    entri heap yang basi dibuang saat di-pop (lazy deletion + closed set),
+    dan hasilnya langsung list langkah [(car_id, delta), …] atau None.
+    Seri f diputus dengan g terbesar dulu (lebih dekat ke goal).
+    moves: model langkah di MOVE_MODELS. Untuk 'macro' (biaya = jumlah
+    gerakan mobil) heuristik harus admissible untuk metrik itu, yaitu
+    'vehicle_moves'; heuristik lain hanya untuk 'unit'/'macro_slides'.
+    """
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic)
+    neighbors_fn, move_cost = _move_model(moves, weighted=True)
+    start = as_compact(initial_state)
+    start_key = start.key()
+    g_cost = _table(stats)
+    g_cost[start_key] = 0
+    parents = _table(stats)
+    parents[start_key] = None
+    closed = _set(stats)
+    counter = itertools.count()
+    heuristic = _timed(stats, 'heuristic', heuristic)
+    expand = _timed(stats, 'neighbors', neighbors_fn)
+    heappush = _timed(stats, 'frontier', heapq.heappush)
+    heappop = _timed(stats, 'frontier', heapq.heappop)
+    heap = [(heuristic(start, None), 0, next(counter), start)]
+
+    while heap:
+        _, neg_g, _, state = heappop(heap)
+        key = state.key()
+        if key in closed or -neg_g > g_cost[key]:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+
+        if state.is_goal():
+            return reconstruct_path(parents, key)
+        closed.add(key)
+
+        neighbors = expand(state)
+        if stats is not None:
+            stats.depth = -neg_g
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+        for next_state, move_info in neighbors:
+            new_cost = -neg_g + (1 if move_cost is None else move_cost(move_info))
+            next_key = next_state.key()
+            if new_cost < g_cost.get(next_key, math.inf):
+                g_cost[next_key] = new_cost
+                parents[next_key] = (key, move_info)
+                # heuristik yang tidak konsisten bisa membuka ulang node
+                closed.discard(next_key)
+                heappush(heap, (new_cost + heuristic(next_state, None),
+                                      -new_cost, next(counter), next_state))
+        if stats is not None:
+            stats.frontier_peak = max(stats.frontier_peak, len(heap))
+
+    return None
+
+def anytime_solutions(initial_state, heuristic='blocking', weights=(5, 3, 2, 1.5, 1.2, 1),
+                      stats=None):
+    """
+    Anytime Repairing A* (ARA*): A* berbobot f = g + w*h dengan w turun
+    mengikuti `weights`. Iterasi pertama (w besar) cepat menemukan path
+    yang belum tentu optimal; iterasi berikutnya memakai ulang tabel g dan
+    frontier, hanya membuka ulang state yang g-nya membaik (INCONS), jadi
+    tidak mulai dari nol.
+
+    Generator yang menghasilkan (path, bound) setiap kali path membaik atau
+    bound-nya mengetat: len(path) <= bound * optimal, dengan bound =
+    min(w, len(path) / min(g + h) di frontier). bound 1.0 berarti optimal
+    dan generator selesai. Bound hanya terjamin untuk heuristik konsisten
+    (mis. 'manhattan', 'blocking'). Langkah satu sel (moves='unit').
+    """
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic)
+    start = as_compact(initial_state)
+    if start.is_goal():
+        yield [], 1.0
+        return
+    heuristic = _timed(stats, 'heuristic', heuristic)
+    expand = _timed(stats, 'neighbors', get_neighbors)
+    start_key = start.key()
+    g_cost = _table(stats)
+    g_cost[start_key] = 0
+    parents = _table(stats)
+    parents[start_key] = None
+    # key -> (h, state) untuk state di frontier (OPEN) dan state closed yang g-nya membaik
+    open_nodes = {start_key: (heuristic(start, None), start)}
+    incons = {}
+    counter = itertools.count()
+    goal_g, goal_key = math.inf, None
+    reported = (math.inf, math.inf)
+
+    for w in weights:
+        open_nodes.update(incons)
+        incons = {}
+        closed = _set(stats)
+        heap = [(g_cost[key] + w * h, -g_cost[key], next(counter), key)
+                for key, (h, _) in open_nodes.items()]
+        heapq.heapify(heap)
+
+        while heap:
+            f, neg_g, _, key = heap[0]
+            if key not in open_nodes or -neg_g != g_cost[key]:
+                heapq.heappop(heap)
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            if goal_g <= f:
+                break
+            heapq.heappop(heap)
+            _, state = open_nodes.pop(key)
+            closed.add(key)
+
+            neighbors = expand(state)
+            if stats is not None:
+                stats.depth = -neg_g
+                stats.expanded += 1
+                stats.generated += len(neighbors)
+            new_cost = 1 - neg_g
+            for next_state, move_info in neighbors:
+                next_key = next_state.key()
+                if new_cost >= g_cost.get(next_key, math.inf):
+                    continue
+                g_cost[next_key] = new_cost
+                parents[next_key] = (key, move_info)
+                if next_state.is_goal():
+                    if new_cost < goal_g:
+                        goal_g, goal_key = new_cost, next_key
+                    continue
+                h = heuristic(next_state, None)
+                if next_key in closed:
+                    incons[next_key] = (h, next_state)
+                else:
+                    open_nodes[next_key] = (h, next_state)
+                    heapq.heappush(heap, (new_cost + w * h, -new_cost, next(counter), next_key))
+            if stats is not None:
+                stats.frontier_peak = max(stats.frontier_peak, len(heap))
+
+        if goal_key is None:
+            if not open_nodes:
+                return      # seluruh komponen sudah diekspansi, tidak ada goal
+            continue
+        lower = min((g_cost[key] + h for nodes in (open_nodes, incons)
+                     for key, (h, _) in nodes.items()), default=math.inf)
+        bound = max(1.0, min(w, goal_g / lower))
+        if (goal_g, bound) < reported:
+            reported = (goal_g, bound)
+            yield reconstruct_path(parents, goal_key), bound
+        if bound == 1.0:
+            return
+
+def anytime_a_star(initial_state, heuristic='blocking', weights=(5, 3, 2, 1.5, 1.2, 1),
+                   stats=None, on_solution=None):
+    """
+    anytime_solutions() dengan antarmuka SOLVERS: return path terakhir
+    (terbaik) atau None. on_solution(path, bound) dipanggil untuk setiap
+    path yang membaik, mis. untuk mulai animasi sebelum search selesai.
+    """
+    best = None
+    for best, bound in anytime_solutions(initial_state, heuristic, weights, stats):
+        if on_solution is not None:
+            on_solution(best, bound)
+    return best
+
+def beam_search(initial_state, width=1000, heuristic='blocking', max_depth=10000, stats=None):
+    """
+    Beam search: BFS layer demi layer, tapi dari semua tetangga baru satu
+    layer hanya `width` state dengan h terkecil yang disimpan (seri diputus
+    urutan ditemukan); sisanya dibuang (stats.pruned). Duplikat dideteksi
+    lewat key() semua state yang pernah disimpan. Memori O(width * depth),
+    bukan sebesar ruang state, sebagai gantinya path tidak dijamin optimal
+    dan search bisa gagal (None) kalau beam buntu walau solusi ada.
+    """
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic)
+    start = as_compact(initial_state)
+    if start.is_goal():
+        return []
+    heuristic = _timed(stats, 'heuristic', heuristic)
+    expand = _timed(stats, 'neighbors', get_neighbors)
+    parents = _table(stats)
+    parents[start.key()] = None
+    layer = [start]
+
+    for depth in range(max_depth):
+        candidates = {}
+        for state in layer:
+            key = state.key()
+            neighbors = expand(state)
+            if stats is not None:
+                stats.depth = depth
+                stats.expanded += 1
+                stats.generated += len(neighbors)
+            for next_state, move_info in neighbors:
+                next_key = next_state.key()
+                if next_key in parents or next_key in candidates:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                if next_state.is_goal():
+                    parents[next_key] = (key, move_info)
+                    return reconstruct_path(parents, next_key)
+                candidates[next_key] = (heuristic(next_state, None), next_state, key, move_info)
+        if stats is not None:
+            stats.frontier_peak = max(stats.frontier_peak, len(candidates))
+            stats.pruned += max(0, len(candidates) - width)
+        layer = []
+        for next_key, (_, next_state, key, move_info) in heapq.nsmallest(
+                width, candidates.items(), key=lambda item: item[1][0]):
+            parents[next_key] = (key, move_info)
+            layer.append(next_state)
+        if not layer:
+            return None
+    return None
+
 def heuristic_euclidean(positions:dict, node, goal):
     x1, y1 = positions[node]
     x2, y2 = positions[goal]
     return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
 
 def heuristic_manhattan(state, goal):
+    """Sisa langkah mobil 'sh' ke pintu keluar (admissible)."""
+    if isinstance(state, CompactState):
+        board = state.board
+        return abs(board.goal - state.heads[board.red])
     car = state.cars['sh']
-    return 5 - car.col 
+    return abs(state.exit_head() - (car.row if car.orientation == 'v' else car.col))
+
+def _blockers(state):
+    """Index mobil yang menempati sel antara mobil 'sh' dan pintu keluar."""
+    board = state.board
+    red = board.red
+    ahead = board.exit_mask(state.heads[red])
+    return [i for i, p in enumerate(state.heads)
+            if i != red and board.masks[i][p] & ahead]
+
+def heuristic_blocking(state, goal):
+    """Jarak mobil 'sh' + jumlah mobil yang menghalanginya (tiap penghalang >= 1 langkah)."""
+    state = as_compact(state)
+    return heuristic_manhattan(state, goal) + len(_blockers(state))
+
+def heuristic_vehicle_moves(state, goal):
+    """
+    Untuk metrik jumlah gerakan mobil (moves='macro'): 1 untuk 'sh' kalau
+    belum di goal + 1 per penghalang (admissible untuk metrik itu).
+    """
+    state = as_compact(state)
+    if state.is_goal():
+        return 0
+    return 1 + len(_blockers(state))
+
+def _clear_options(state, i, occupied):
+    """
+    Cara mobil i (tegak lurus mobil 'sh') keluar dari jalur mobil 'sh':
+    list (langkah, set mobil yang harus minggir) per arah yang tidak
+    ditutup mobil diam.
+    """
+    board = state.board
+    red_line = board.lines[board.red]
+    p, length, masks = state.heads[i], board.lengths[i], board.masks[i]
+    options = []
+    for q in (red_line - length, red_line + 1):
+        if q < 0 or q >= len(masks):
+            continue
+        span = 0
+        for h in range(min(p, q), max(p, q) + 1):
+            span |= masks[h]
+        needed = span & ~masks[p]
+        blocking = {j for j, mask in occupied if j != i and mask & needed}
+        if any(not board.movable[j] for j in blocking):
+            continue
+        options.append((abs(q - p), blocking))
+    return options
+
+def heuristic_blockers_of_blockers(state, goal):
+    """
+    Lower bound rekursif: jarak 'sh' + langkah minimum tiap penghalang untuk
+    keluar dari jalur 'sh' + 1 untuk tiap mobil yang menutup SEMUA arah
+    keluar sebuah penghalang (mobil-mobil ini berbeda, jadi tetap admissible).
+    """
+    state = as_compact(state)
+    board = state.board
+    blockers = _blockers(state)
+    total = heuristic_manhattan(state, goal)
+    occupied = [(j, board.masks[j][p]) for j, p in enumerate(state.heads)]
+    second = set()
+    for i in blockers:
+        options = _clear_options(state, i, occupied) \
+            if board.orientations[i] != board.orientations[board.red] else []
+        if not options:
+            total += 1
+            continue
+        total += min(steps for steps, _ in options)
+        second |= set.intersection(*(blocking for _, blocking in options))
+    second -= set(blockers)
+    second.discard(board.red)
+    return total + len(second)
+
+def _pattern_database(state, max_cars=6):
+    """
+    Abstraksi: hanya mobil 'sh', mobil diam, mobil sejajar di jalur 'sh'
+    dan sampai `max_cars` mobil tegak lurus terdekat di antara 'sh' dan
+    pintu keluar; mobil lain dihapus (relaksasi). Jarak goal tiap state abstrak dihitung sekali dengan
+    BFS mundur dari goal_configurations dan disimpan di board.cache.
+    """
+    board = state.board
+    table = board.cache.get('pattern_db')
+    if table is not None:
+        return table
+
+    red = board.red
+    red_ori, red_line = board.orientations[red], board.lines[red]
+    head = state.heads[red]
+    if board.exit in ('right', 'bottom'):
+        on_path = lambda line: line >= head + board.lengths[red]
+    else:
+        on_path = lambda line: line < head
+    crossing = sorted((i for i in range(len(board.ids))
+                       if board.movable[i] and board.orientations[i] != red_ori
+                       and on_path(board.lines[i])),
+                      key=lambda i: abs(board.lines[i] - head))[:max_cars]
+    pattern = [i for i in range(len(board.ids))
+               if i == red or not board.movable[i] or i in crossing
+               or (board.orientations[i] == red_ori and board.lines[i] == red_line)]
+
+    full = state.to_state()
+    sub = RushHourState({board.ids[i]: full.cars[board.ids[i]] for i in pattern},
+                        board.grid_size, board.exit).to_compact()
+    goals = goal_configurations(sub)
+    dist = {g.heads: 0 for g in goals}
+    layer, depth = goals, 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for st in layer:
+            for nxt, _ in st.neighbors():
+                if nxt.heads not in dist:
+                    dist[nxt.heads] = depth
+                    next_layer.append(nxt)
+        layer = next_layer
+
+    table = board.cache['pattern_db'] = (tuple(pattern), dist)
+    return table
+
+def heuristic_pattern_db(state, goal):
+    """Jarak eksak di abstraksi _pattern_database (admissible)."""
+    state = as_compact(state)
+    pattern, dist = _pattern_database(state)
+    heads = state.heads
+    return dist.get(tuple(heads[i] for i in pattern), math.inf)
+
+HEURISTICS = {
+    'manhattan': heuristic_manhattan,
+    'blocking': heuristic_blocking,
+    'blockers': heuristic_blockers_of_blockers,
+    'pattern_db': heuristic_pattern_db,
+    'vehicle_moves': heuristic_vehicle_moves,
+}
+
+def get_heuristic(name):
+    try:
+        return HEURISTICS[name]
+    except KeyError:
+        raise ValueError(f"unknown heuristic {name!r}, pilih salah satu dari {sorted(HEURISTICS)}")
 
 
 def get_neighbors_astar(state):
+    if isinstance(state, CompactState):
+        return [(nxt, 1) for nxt, _ in state.neighbors()]
     neighbors = []
     for car in state.cars.values():
         for delta in [-1, 1]:
@@ -122,29 +912,29 @@ def legal_head_positions(state, car):
     dan tidak keluar dari grid.
     """
     
-    occupied_others = state.occupied() - set(car.positions())
+    grid = state.grid()
     heads = set()
 
     if car.orientation == 'h':
   
         col = car.col
-        while col-1 >= 0 and (car.row, col-1) not in occupied_others:
+        while col-1 >= 0 and grid[car.row][col-1] is None:
             col -= 1
             heads.add((car.row, col))
        
         col = car.col
-        while col+car.length < state.grid_size \
-              and (car.row, col+car.length) not in occupied_others:
+        while col+car.length < state.cols \
+              and grid[car.row][col+car.length] is None:
             col += 1
             heads.add((car.row, col))
     else: 
         row = car.row
-        while row-1 >= 0 and (row-1, car.col) not in occupied_others:
+        while row-1 >= 0 and grid[row-1][car.col] is None:
             row -= 1
             heads.add((row, car.col))
         row = car.row
-        while row+car.length < state.grid_size \
-              and (row+car.length, car.col) not in occupied_others:
+        while row+car.length < state.rows \
+              and grid[row+car.length][car.col] is None:
             row += 1
             heads.add((row, car.col))
 
@@ -152,45 +942,178 @@ def legal_head_positions(state, car):
     return heads
 
 
-def ac3_filter(state):
+def _ac3_tables(board):
     """
-    Return: dict  car_id -> set(head_pos) sesudah arc‑consistency,
-            atau None kalau ada domain kosong (dead‑end).
+    Tabel konflik AC-3, dibuat sekali per board (board.cache['ac3']):
+    support[i][j][p] = bitset head mobil j yang tidak bertabrakan dengan
+    mobil i ber-head p. Hanya pasangan yang jalurnya berpotongan (pernah
+    bisa bertabrakan) yang disimpan; arcs[i] = daftar j tersebut.
     """
+    tables = board.cache.get('ac3')
+    if tables is not None:
+        return tables
+    n = len(board.ids)
+    support = [{} for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            full = (1 << len(board.masks[j])) - 1
+            rows = []
+            for mask_i in board.masks[i]:
+                ok = 0
+                for q, mask_j in enumerate(board.masks[j]):
+                    if not mask_i & mask_j:
+                        ok |= 1 << q
+                rows.append(ok)
+            if any(row != full for row in rows):
+                support[i][j] = rows
+    tables = board.cache['ac3'] = (support, [list(sup) for sup in support])
+    return tables
+
+def legal_head_bits(state, i):
+    """legal_head_positions untuk CompactState, sebagai bitset head."""
+    board = state.board
+    p = state.heads[i]
+    bits = 1 << p
+    if not board.movable[i]:
+        return bits
+    masks = board.masks[i]
+    rest = state.occ ^ masks[p]
+    q = p - 1
+    while q >= 0 and not rest & masks[q]:
+        bits |= 1 << q
+        q -= 1
+    q = p + 1
+    while q < len(masks) and not rest & masks[q]:
+        bits |= 1 << q
+        q += 1
+    return bits
+
+def get_macro_neighbors(state):
+    """
+    Model langkah makro: satu langkah = satu mobil digeser langsung ke head
+    legal mana pun di jalurnya (legal_head_positions), jadi delta bisa > 1.
+    Return list (next_state, (car_id, delta)) seperti get_neighbors.
+    """
+    if not isinstance(state, CompactState):
+        neighbors = []
+        for car in state.cars.values():
+            if not car.movable:
+                continue
+            for row, col in sorted(legal_head_positions(state, car)):
+                if (row, col) == (car.row, car.col):
+                    continue
+                new_state = deepcopy(state)
+                new_state.place_car(new_state.cars[car.id], row, col)
+                delta = (row - car.row) + (col - car.col)
+                neighbors.append((new_state, (car.id, delta)))
+        return neighbors
+    result = []
+    for i, p in enumerate(state.heads):
+        bits = legal_head_bits(state, i) & ~(1 << p)
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            nxt = state.slide(i, low.bit_length() - 1 - p)
+            result.append((nxt, nxt.move))
+    return result
+
+# model langkah: nama -> (fungsi tetangga, biaya per langkah atau None = 1)
+#   unit         : geser satu sel, biaya 1
+#   macro        : geser sejauh apa pun, biaya 1 (metrik jumlah gerakan mobil)
+#   macro_slides : geser sejauh apa pun, biaya |delta| (metrik sama dgn 'unit')
+MOVE_MODELS = {
+    'unit': (get_neighbors, None),
+    'macro': (get_macro_neighbors, None),
+    'macro_slides': (get_macro_neighbors, lambda move: abs(move[1])),
+}
+
+def _move_model(moves, weighted=False):
+    try:
+        neighbors_fn, move_cost = MOVE_MODELS[moves]
+    except KeyError:
+        raise ValueError(f"unknown move model {moves!r}, pilih salah satu dari {sorted(MOVE_MODELS)}")
+    if move_cost is not None and not weighted:
+        raise ValueError(f"move model {moves!r} berbobot, pakai a_star_moves")
+    return neighbors_fn, move_cost
+
+def ac3_domains(state, domains=None):
+    """
+    AC-3 dengan domain bitset (bit p = head p di jalur mobil) dan tabel
+    konflik _ac3_tables. Domain awal: legal_head_bits tiap mobil, atau
+    `domains` (list bitset, tidak diubah). Return list bitset per index
+    mobil, atau None kalau ada domain kosong (dead-end).
+    """
+    state = as_compact(state)
+    support, arcs = _ac3_tables(state.board)
+    if domains is None:
+        doms = [legal_head_bits(state, i) for i in range(len(state.heads))]
+    else:
+        doms = list(domains)
 
-    domains = {c.id: legal_head_positions(state, c) for c in state.cars.values()}
-    queue   = deque((xi, xj)
-                    for xi in domains for xj in domains if xi != xj)
-
-    def cells_at(car, head_row, head_col):
-        if car.orientation == 'h':
-            return [(head_row, head_col + i) for i in range(car.length)]
-        else:
-            return [(head_row + i, head_col) for i in range(car.length)]
+    queue = deque((i, j) for i in range(len(doms)) for j in arcs[i])
+    if not _propagate(doms, queue, support, arcs):
+        return None
+    return doms
 
-    def overlap(car_i_id, pos_i, car_j_id, pos_j):
-        car_i = state.cars[car_i_id]
-        car_j = state.cars[car_j_id]
-        cells_i = cells_at(car_i, pos_i[0], pos_i[1])
-        cells_j = cells_at(car_j, pos_j[0], pos_j[1])
-        return any(c in cells_j for c in cells_i)
+def _propagate(doms, queue, support, arcs, trail=None):
+    """
+    Loop revisi AC-3 atas `doms` (diubah di tempat) mulai dari arc di
+    `queue`. Kalau `trail` diberikan, tiap domain yang berubah dicatat
+    dulu sebagai (index, bitset lama) supaya bisa di-undo. False kalau ada
+    domain yang kosong.
+    """
+    queued = set(queue)
+    while queue:
+        arc = queue.popleft()
+        queued.discard(arc)
+        i, j = arc
+        rows, dom_j = support[i][j], doms[j]
+        kept = bits = doms[i]
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            if not dom_j & rows[low.bit_length() - 1]:
+                kept ^= low
+        if kept != doms[i]:
+            if not kept:
+                return False
+            if trail is not None:
+                trail.append((i, doms[i]))
+            doms[i] = kept
+            for k in arcs[i]:
+                if k != j and (k, i) not in queued:
+                    queue.append((k, i))
+                    queued.add((k, i))
+    return True
 
+def ac3_filter(state):
+    """
+    Return: dict  car_id -> set(head_pos) sesudah arc‑consistency,
+            atau None kalau ada domain kosong (dead‑end).
+    """
+    state = as_compact(state)
+    doms = ac3_domains(state)
+    if doms is None:
+        return None
+    board = state.board
+    return {cid: {board.cell(i, p) for p in range(len(board.masks[i])) if doms[i] >> p & 1}
+            for i, cid in enumerate(board.ids)}
 
-    while queue:
-        xi, xj = queue.popleft()
-        removed = set()
-        for pos_i in domains[xi]:
-        
-            if all(overlap(xi, pos_i, xj, pos_j) for pos_j in domains[xj]):
-                removed.add(pos_i)
-        if removed:
-            domains[xi] -= removed
-            if not domains[xi]:
-                return None                    
-            for xk in domains:
-                if xk != xi and xk != xj:
-                    queue.append((xk, xi))
-    return domains
+def forward_check_bits(domains, i, head, board):
+    """
+    forward_check untuk domain bitset: mobil i baru pindah ke `head`,
+    buang head mobil lain yang bertabrakan (lewat tabel konflik).
+    Mengubah `domains` di tempat; False kalau ada yang kosong.
+    """
+    support, arcs = _ac3_tables(board)
+    for j in arcs[i]:
+        dom = domains[j] & support[i][j][head]
+        if not dom:
+            return False
+        domains[j] = dom
+    return True
 
 def forward_check(domains, moved_id, moved_head, state):
     """
@@ -215,112 +1138,321 @@ def forward_check(domains, moved_id, moved_head, state):
             return False 
     return True
 
-def ac3_dfs(initial_state):
+def ac3_dfs(initial_state, stats=None, mac=False, moves='unit'):
     """
     Depth‑First Search + satu kali AC‑3 + forward checking.
+    Dengan mac=True arc-consistency dijaga penuh di tiap node (lihat
+    _mac_dfs), bukan hanya forward checking. moves: 'unit' atau 'macro'.
     Return path  [(car_id, delta), …]  atau  None kalau buntu.
     """
-    domains = ac3_filter(initial_state)
+    start = as_compact(initial_state)
+    domains = ac3_domains(start)
     if domains is None:
         return None
+    expand = _timed(stats, 'neighbors', _move_model(moves)[0])
+    if mac:
+        return _mac_dfs(start, domains, stats, expand)
 
-    stack = [(initial_state, [], domains)]
-    visited = set()
+    board = start.board
+    stack = _queue(stats, [(start, domains, None, None)])
+    parents = _table(stats)
+    check = _timed(stats, 'constraints', forward_check_bits)
+    copy_domains = _timed(stats, 'domains', list)
 
     while stack:
-        state, path, doms = stack.pop()
-        key = tuple((c.id, c.row, c.col) for c in state.cars.values())
-        if key in visited:
+        state, doms, parent_key, move_info = stack.pop()
+        key = state.key()
+        if key in parents:
+            if stats is not None:
+                stats.duplicates += 1
             continue
-        visited.add(key)
+        parents[key] = None if parent_key is None else (parent_key, move_info)
 
         if state.is_goal():
-            return path
-
-        for next_state, move_info in get_neighbors(state):
-            cid, delta = move_info
-            car = state.cars[cid]
-            if car.orientation == 'h':
-                new_head = (car.row, car.col + delta)
-            else:
-                new_head = (car.row + delta, car.col)
-
-            new_domains = {k: set(v) for k, v in doms.items()}
-            new_domains[cid] = {new_head}
-
-            if not forward_check(new_domains, cid, new_head, next_state):
+            return reconstruct_path(parents, key)
+
+        neighbors = expand(state)
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+            stats.frontier_peak = max(stats.frontier_peak, len(stack) + len(neighbors))
+        for next_state, move_info in neighbors:
+            i = board.index[move_info[0]]
+            new_head = next_state.heads[i]
+
+            new_domains = copy_domains(doms)
+            new_domains[i] = 1 << new_head
+
+            if not check(new_domains, i, new_head, board):
+                if stats is not None:
+                    stats.pruned += 1
                 continue 
 
-            stack.append((next_state, path + [move_info], new_domains))
+            stack.append((next_state, new_domains, key, move_info))
+
+    return None
 
+def _mac_dfs(start, domains, stats, expand):
+    """
+    DFS dengan Maintaining Arc Consistency. Satu list domain dipakai
+    bersama seluruh search: langkah mobil i ke head q mengeset domain i ke
+    {q} lalu menjalankan AC-3 hanya dari arc (k, i), dan setiap perubahan
+    domain dicatat di `trail`. Saat mundur (atau kalau propagasi gagal),
+    trail di-pop sampai tanda milik node itu, jadi tidak ada salinan
+    domain per anak. Stack berisi (iterator tetangga, tanda trail) supaya
+    path ribuan langkah tidak kena batas rekursi.
+    """
+    board = start.board
+    support, arcs = _ac3_tables(board)
+    doms = domains
+    trail = []
+    path = []
+    visited = _set(stats)
+    visited.add(start.key())
+
+    def undo(mark):
+        while len(trail) > mark:
+            i, bits = trail.pop()
+            doms[i] = bits
+
+    def assign(i, head):
+        trail.append((i, doms[i]))
+        doms[i] = 1 << head
+        return _propagate(doms, deque((k, i) for k in arcs[i]), support, arcs, trail)
+    assign = _timed(stats, 'constraints', assign)
+
+    def push(state, mark):
+        neighbors = expand(state)
+        if stats is not None:
+            stats.depth = len(path)
+            stats.expanded += 1
+            stats.generated += len(neighbors)
+            stats.frontier_peak = max(stats.frontier_peak, len(stack) + 1)
+        stack.append((iter(neighbors), mark))
+
+    if start.is_goal():
+        return []
+    stack = []
+    push(start, 0)
+    while stack:
+        children, mark = stack[-1]
+        for next_state, move_info in children:
+            key = next_state.key()
+            if key in visited:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            child_mark = len(trail)
+            i = board.index[move_info[0]]
+            if not assign(i, next_state.heads[i]):
+                undo(child_mark)
+                if stats is not None:
+                    stats.pruned += 1
+                continue
+            visited.add(key)
+            path.append(move_info)
+            if next_state.is_goal():
+                return path
+            push(next_state, child_mark)
+            break
+        else:
+            stack.pop()
+            undo(mark)
+            if path:
+                path.pop()
     return None
 
-def iddfs(state, max_depth: int = 40):
+def iddfs(state, max_depth: int = 40, stats=None):
     """
     Iterative Deepening DFS:
       –  optimise path length (sama dgn BFS)
       –  memori kecil
     """
+    state = as_compact(state)
+    red = state.board.red
+    goal = state.board.goal
+    expand = _timed(stats, 'neighbors', get_neighbors)
+
     for depth_limit in range(max_depth + 1):
+        if stats is not None:
+            stats.depth = depth_limit
 
-        visited_local = set()
+        visited_local = _set(stats)
 
         def dfs_ordered_neighbors(state):
             """
             Menghasilkan tetangga yang sudah di‑sort agar DFS cenderung
             menemukan solusi lebih cepat (lebih sedikit langkah).
             """
-            neigh = get_neighbors(state)      
+            neigh = expand(state)      
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(neigh)
     
             def score(pair):
                 st, (cid, delta) = pair
                 if cid == 'sh':               
                     return 100 if delta == 1 else 50  
-                red = st.cars['sh']
-                return 5 - red.col             
+                return 1 + abs(goal - st.heads[red])
     
             neigh.sort(key=score, reverse=True)
             return neigh
     
-        def dfs_limited(st, path, depth):
+        path = []
+
+        def dfs_limited(st, depth):
       
             if st.is_goal():
-                return path
+                return list(path)
       
             if depth == 0:
                 return None
         
-            key = tuple(sorted((c.id, c.row, c.col) for c in st.cars.values()))
+            key = st.key()
             if key in visited_local:
+                if stats is not None:
+                    stats.duplicates += 1
                 return None
             visited_local.add(key)
+            if stats is not None:
+                stats.frontier_peak = max(stats.frontier_peak, len(path) + 1)
 
+            # satu list path dipakai bersama: append sebelum turun, pop saat mundur
             for nxt_state, mv in dfs_ordered_neighbors(st):
-                res = dfs_limited(nxt_state, path + [mv], depth - 1)
-                if res:
+                path.append(mv)
+                res = dfs_limited(nxt_state, depth - 1)
+                path.pop()
+                if res is not None:
                     return res
 
             visited_local.remove(key)       
             return None
 
-        sol = dfs_limited(state, [], depth_limit)
-        if sol:
+        sol = dfs_limited(state, depth_limit)
+        if sol is not None:
             return sol    
 
     return None        
 
 
-def ac3_iddfs(initial_state, max_depth: int = 40):
+class TranspositionTable:
+    """
+    Tabel transposisi berukuran tetap (LRU): key state -> (g terkecil yang
+    pernah dicapai, iterasi terakhir state itu dikunjungi dengan g tsb).
+    """
+
+    def __init__(self, max_size=1 << 18):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, g, iteration):
+        self.entries[key] = (g, iteration)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+def ida_star(initial_state, heuristic='manhattan', max_bound=500,
+             table_size=1 << 18, stats=None):
+    """
+    IDA*: DFS dengan batas f = g + h yang dinaikkan tiap iterasi ke f
+    terkecil yang melewati batas. Memakai heuristik yang sama dengan a_star
+    (nama di HEURISTICS atau fungsi), langkah make/unmake langsung pada list
+    head + bitmask (tanpa copy), dan satu TranspositionTable untuk semua
+    iterasi: node dipangkas kalau sudah pernah dicapai dengan g lebih kecil,
+    atau dengan g sama di iterasi ini. Return path optimal atau None.
+    """
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic)
+    start = as_compact(initial_state)
+    board = start.board
+    masks, movable = board.masks, board.movable
+    heads = list(start.heads)
+    table = TranspositionTable(table_size)
+    path = []
+    occ, code, bits = start.occ, start.code, board.bits
+
+    def search(g, bound, iteration):
+        nonlocal occ, code
+        key = code
+        state = CompactState(board, tuple(heads), occ, code=code)
+        f = g + heuristic(state, None)
+        if f > bound:
+            return f
+        if state.is_goal():
+            return True
+
+        entry = table.get(key)
+        if entry is not None and (entry[0] < g or (entry[0] == g and entry[1] == iteration)):
+            if stats is not None:
+                stats.duplicates += 1
+            return math.inf
+        table.put(key, g, iteration)
+        if stats is not None:
+            stats.expanded += 1
+            stats.frontier_peak = max(stats.frontier_peak, len(path) + 1)
+
+        minimum = math.inf
+        for i in range(len(heads)):
+            if not movable[i]:
+                continue
+            p = heads[i]
+            rest = occ ^ masks[i][p]
+            for delta in (-1, 1):
+                q = p + delta
+                if q < 0 or q >= len(masks[i]) or rest & masks[i][q]:
+                    continue
+                if stats is not None:
+                    stats.generated += 1
+                # make
+                heads[i] = q
+                occ = rest | masks[i][q]
+                code += delta << bits * i
+                path.append((board.ids[i], delta))
+                result = search(g + 1, bound, iteration)
+                if result is True:
+                    return True
+                # unmake
+                path.pop()
+                heads[i] = p
+                occ = rest | masks[i][p]
+                code -= delta << bits * i
+                minimum = min(minimum, result)
+        return minimum
+
+    bound = heuristic(start, None)
+    iteration = 0
+    while bound <= max_bound:
+        if stats is not None:
+            stats.depth = bound
+        result = search(0, bound, iteration)
+        if result is True:
+            return list(path)
+        if result == math.inf:
+            return None
+        bound = result
+        iteration += 1
+    return None
+
+def ac3_iddfs(initial_state, max_depth: int = 40, stats=None):
     """
     1. AC‑3 sekali di state awal – mendeteksi dead‑end cepat.
     2. Jika masih konsisten, jalankan IDDFS optimal.
     """
-    if ac3_filter(initial_state) is None:
+    if ac3_domains(initial_state) is None:
         return None                   
-    return iddfs(initial_state, max_depth)
+    return iddfs(initial_state, max_depth, stats)
 
 
-def ac3_bfs(initial_state):
+def ac3_bfs(initial_state, on_generate=True, stats=None, moves='unit'):
     """
     • Jalankan AC‑3 sekali di root.  
     • Jika domain kosong ➜  None (dead‑end).  
@@ -329,101 +1461,353 @@ def ac3_bfs(initial_state):
     Return: list langkah [(car_id, delta), …] atau None.
     """
 
-    if ac3_filter(initial_state) is None:
+    if ac3_domains(initial_state) is None:
         return None                    
 
+    return bfs(initial_state, on_generate, stats, moves)
 
-    visited = set()
-    queue   = deque([(initial_state, [])]) 
-
-    while queue:
-        state, path = queue.popleft()
-        key = tuple((c.id, c.row, c.col) for c in state.cars.values())
-        if key in visited:
-            continue
-        visited.add(key)
-
-        if state.is_goal():
-            return path                 
-
-        for next_state, move_info in get_neighbors(state):
-            queue.append((next_state, path + [move_info]))
 
-    return None 
-
-
-
-import math
-import random
-from copy import deepcopy
+def _partition(code, parts):
+    """Pemilik state `code` di antara `parts` partisi (Fibonacci hashing 64-bit)."""
+    return (((code * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % parts
 
-def simulated_annealing_solver(initial_state, max_iter=5000, start_temp=500, cooling_rate=0.995, percobaan = 0):
-    def is_goal(state):
-        red_car = state.cars['sh']
-        return red_car.col + red_car.length >= state.grid_size
-
-    def cost(state):
-        red_car = state.cars['sh']
-        col = red_car.col + red_car.length
-        blocking = 0
-        for car in state.cars.values():
-            if car.id == 'sh':
-                continue
-            if car.orientation == 'v':
-                if car.col in range(col, state.grid_size) and red_car.row in [car.row + i for i in range(car.length)]:
-                    blocking += 1
-            elif car.orientation == 'h':
-                if car.row == red_car.row and any(red_car.col < car.col + i < state.grid_size for i in range(car.length)):
-                    blocking += 1
-        return blocking + (5 - red_car.col)
-
-    def get_neighbors_sa(state):
-        neighbors = []
-        for car in state.cars.values():
-            for delta in [-1, 1]:
-                new_state = deepcopy(state)
-                car_copy = new_state.cars[car.id]
-                if move_car(car_copy, delta, new_state):
-                    neighbors.append((new_state, (car.id, delta)))
-        return neighbors
-
-    current = deepcopy(initial_state)
-    current_cost = cost(current)
-    temp = start_temp
-    best = deepcopy(current)
-    best_cost = current_cost
+def _bfs_partition(conn, initial_state, part, parts, inherited=()):
+    """
+    Proses worker parallel_bfs untuk partisi `part`: menyimpan parent
+    table dan frontier state miliknya, dan menjalankan perintah dari
+    koordinator lewat `conn` sampai 'stop' atau pipe tertutup.
+
+    'expand'  : ekspansi frontier; anak (key, key parent, move) ditulis ke
+                satu SharedMemory, dikelompokkan per partisi tujuan.
+                Balas (nama shm, offset per partisi, expanded, generated).
+    'merge'   : baca bagian milik partisi ini dari shm semua worker;
+                state yang belum dikenal masuk parent table dan frontier
+                baru. Balas (ukuran frontier, duplikat, key goal atau None).
+    'parent'  : balas entri parent table untuk satu key.
+    Segmen shm layer sebelumnya di-unlink pembuatnya di perintah berikutnya;
+    saat itu semua worker pasti sudah selesai membacanya.
+
+    `inherited`: ujung pipe koordinator ke worker lain yang ikut ter-fork;
+    ditutup supaya worker itu mendapat EOF kalau koordinator mati.
+    """
+    for other in inherited:
+        other.close()
+    board = as_compact(initial_state).board
+    red_shift, field = board.bits * board.red, (1 << board.bits) - 1
+    parents, frontier, out = {}, [], None
+    try:
+        while True:
+            command, arg = conn.recv()
+            if out is not None and command != 'merge':
+                out.close()
+                out.unlink()
+                out = None
+            if command == 'seed':
+                parents[arg] = None
+                frontier = [arg]
+            elif command == 'expand':
+                buckets = [array('Q') for _ in range(parts)]
+                generated = 0
+                for code in frontier:
+                    heads = board.unpack(code)
+                    state = CompactState(board, heads, board.occupancy(heads), code=code)
+                    for next_state, (cid, delta) in state.neighbors():
+                        generated += 1
+                        bucket = buckets[_partition(next_state.code, parts)]
+                        bucket.append(next_state.code)
+                        bucket.append(code)
+                        bucket.append(2 * board.index[cid] + (delta > 0))
+                offsets = list(itertools.accumulate((len(b) // 3 for b in buckets), initial=0))
+                name = None
+                if offsets[-1]:
+                    data = array('Q', itertools.chain.from_iterable(buckets)).tobytes()
+                    out = shared_memory.SharedMemory(create=True, size=len(data))
+                    out.buf[:len(data)] = data
+                    name = out.name
+                conn.send((name, offsets, len(frontier), generated))
+            elif command == 'merge':
+                frontier, duplicates, goal = [], 0, None
+                for name, start, stop in arg:
+                    shm = shared_memory.SharedMemory(name=name)
+                    view = shm.buf[start * 24:stop * 24].cast('Q')
+                    entries = view.tolist()
+                    view.release()
+                    shm.close()
+                    for j in range(0, len(entries), 3):
+                        code = entries[j]
+                        if code in parents:
+                            duplicates += 1
+                            continue
+                        parents[code] = (entries[j + 1], entries[j + 2])
+                        frontier.append(code)
+                        if goal is None and (code >> red_shift) & field == board.goal:
+                            goal = code
+                conn.send((len(frontier), duplicates, goal))
+            elif command == 'parent':
+                conn.send(parents[arg])
+            elif command == 'stop':
+                break
+    except (EOFError, BrokenPipeError):
+        pass        # koordinator berhenti / dimatikan
+    finally:
+        if out is not None:
+            out.close()
+            out.unlink()
+        conn.close()
+
+def parallel_bfs(initial_state, workers=os.cpu_count(), stats=None):
+    """
+    BFS paralel layer demi layer (bulk synchronous) di `workers` proses.
+    State dibagi ke partisi dengan hash key() (_partition); tiap worker
+    hanya menyimpan parent table partisinya. Per layer: semua worker
+    mengekspansi frontier-nya dan menulis anak ke SharedMemory per
+    partisi tujuan, lalu tiap worker menggabungkan bagian miliknya dari
+    semua segmen (deteksi duplikat lokal, tanpa lock). Goal pertama yang
+    muncul di satu layer optimal; path direkonstruksi dengan menanyakan
+    parent ke worker pemilik tiap state. Langkah satu sel; key harus
+    muat 64 bit. Return path [(car_id, delta), …] atau None.
+    """
+    start = as_compact(initial_state)
+    board = start.board
+    if board.bits * len(board.ids) > 64:
+        raise ValueError("board terlalu besar untuk key 64-bit")
+    if start.is_goal():
+        return []
+    ctx = multiprocessing.get_context()
+    # satu resource tracker bersama; kalau tidak, tiap worker (fork) memulai
+    # tracker sendiri yang menganggap segmen yang hanya ia baca bocor.
+    # Hanya relevan untuk POSIX (fork); Windows tidak punya resource tracker.
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+    conns, procs = [], []
+    try:
+        for part in range(workers):
+            conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_bfs_partition,
+                               args=(child_conn, start, part, workers, conns + [conn]))
+            proc.start()
+            child_conn.close()
+            conns.append(conn)
+            procs.append(proc)
+        conns[_partition(start.key(), workers)].send(('seed', start.key()))
+        depth = 0
+
+        while True:
+            for conn in conns:
+                conn.send(('expand', None))
+            segments = [conn.recv() for conn in conns]
+            for part, conn in enumerate(conns):
+                conn.send(('merge', [(name, offsets[part], offsets[part + 1])
+                                     for name, offsets, _, _ in segments
+                                     if offsets[part] < offsets[part + 1]]))
+            merged = [conn.recv() for conn in conns]
+            if stats is not None:
+                stats.depth = depth
+                stats.expanded += sum(s[2] for s in segments)
+                stats.generated += sum(s[3] for s in segments)
+                stats.duplicates += sum(m[1] for m in merged)
+                stats.frontier_peak = max(stats.frontier_peak, sum(m[0] for m in merged))
+            depth += 1
+
+            goals = [m[2] for m in merged if m[2] is not None]
+            if goals:
+                path, code = [], min(goals)
+                while True:
+                    conn = conns[_partition(code, workers)]
+                    conn.send(('parent', code))
+                    entry = conn.recv()
+                    if entry is None:
+                        break
+                    code, move = entry
+                    path.append((board.ids[move >> 1], 1 if move & 1 else -1))
+                path.reverse()
+                return path
+            if not any(m[0] for m in merged):
+                return None
+    finally:
+        # worker yang idle langsung berhenti; yang masih mengekspansi layer
+        # (search dihentikan lewat exception, mis. SolveAborted) dimatikan
+        for conn in conns:
+            try:
+                conn.send(('stop', None))
+            except OSError:
+                pass
+            conn.close()
+        for proc in procs:
+            proc.join(0.5)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+
+def _anneal_run(state, seed, max_iter=5000, start_temp=500, cooling_rate=0.995, stats=None):
+    """
+    Satu run simulated annealing dengan RNG sendiri (random.Random(seed)).
+    Tiap iterasi mengambil satu langkah acak (mobil + arah dipilih acak,
+    diulang kalau ilegal) tanpa membuat list tetangga; baru kalau semua
+    percobaan gagal dipilih dari daftar langkah legal. Langkah yang
+    diterima langsung diterapkan ke list head + bitmask (seperti ida_star).
+
+    cost = jarak 'sh' ke pintu keluar + jumlah mobil di depannya, dan
+    diperbarui inkremental: langkah mobil lain hanya mengubah status
+    penghalang mobil itu sendiri, langkah 'sh' hanya mengubah jaraknya
+    (sel yang dimasuki/ditinggalkan 'sh' pasti kosong).
+    `stats` (kalau ada) dinaikkan tiap iterasi: expanded = iterasi,
+    generated = langkah legal yang diambil sampelnya.
+    Return dict hasil run (path terbaik, cost, counter).
+    """
+    rng = random.Random(seed)
+    start = as_compact(state)
+    board = start.board
+    red, goal, masks = board.red, board.goal, board.masks
+    cars = [i for i in range(len(start.heads)) if board.movable[i]]
+    heads = list(start.heads)
+    occ = start.occ
+
+    ahead = board.exit_mask(heads[red])
+    cost = abs(goal - heads[red]) + sum(
+        1 for i in cars if i != red and masks[i][heads[i]] & ahead)
+    best_cost, best_len = cost, 0
     path = []
-    best_path = []
-
-    for _ in range(max_iter):
-        if is_goal(current):
-            return path
-
-        neighbors = get_neighbors_sa(current)
-        if not neighbors:
-            continue
-
-        next_state, move_info = random.choice(neighbors)
-        next_cost = cost(next_state)
-        delta_e = current_cost - next_cost
-
-        if delta_e > 0 or random.random() < math.exp(delta_e / temp):
-            current = next_state
-            current_cost = next_cost
-            path.append(move_info)
+    temp = start_temp
+    iterations = accepted = sampled = 0
+    started = perf_counter()
+
+    while iterations < max_iter and cost:
+        iterations += 1
+        if stats is not None:
+            stats.expanded += 1
+        # langkah acak yang legal; batasi percobaan untuk papan yang terkunci
+        for _ in range(8 * len(cars)):
+            i = rng.choice(cars)
+            delta = rng.choice((-1, 1))
+            p = heads[i]
+            q = p + delta
+            if q < 0 or q >= len(masks[i]):
+                continue
+            rest = occ ^ masks[i][p]
+            if not rest & masks[i][q]:
+                break
+        else:
+            # papan rapat: pilih dari daftar semua langkah legal
+            legal = [(j, d) for j in cars for d in (-1, 1)
+                     if 0 <= heads[j] + d < len(masks[j])
+                     and not (occ ^ masks[j][heads[j]]) & masks[j][heads[j] + d]]
+            if not legal:
+                break       # terkunci total, state tidak akan berubah lagi
+            i, delta = rng.choice(legal)
+            p = heads[i]
+            q = p + delta
+            rest = occ ^ masks[i][p]
+        sampled += 1
+        if stats is not None:
+            stats.generated += 1
+
+        if i == red:
+            change = abs(goal - q) - abs(goal - p)
+        else:
+            change = bool(masks[i][q] & ahead) - bool(masks[i][p] & ahead)
+        if change <= 0 or (temp > 0 and rng.random() < math.exp(-change / temp)):
+            heads[i] = q
+            occ = rest | masks[i][q]
+            if i == red:
+                ahead = board.exit_mask(q)
+            cost += change
+            path.append((board.ids[i], delta))
+            accepted += 1
+            if cost < best_cost:
+                best_cost, best_len = cost, len(path)
+        temp *= cooling_rate
 
-            if current_cost < best_cost:
-                best = deepcopy(current)
-                best_cost = current_cost
-                best_path = list(path)
+    return {
+        'seed': seed,
+        'solved': best_cost == 0,
+        'path': path[:best_len],
+        'cost': best_cost,
+        'iterations': iterations,
+        'sampled': sampled,
+        'accepted': accepted,
+        'seconds': perf_counter() - started,
+    }
+
+def anneal(initial_state, restarts=1, workers=1, seed=None, max_iter=5000,
+           start_temp=500, cooling_rate=0.995, stats=None):
+    """
+    Simulated annealing multi-restart: `restarts` run independen dengan seed
+    seed, seed + 1, …, dibagi ke `workers` proses (ProcessPoolExecutor)
+    kalau workers > 1. seed None = ambil dari modul random, jadi
+    random.seed(...) tetap membuat hasilnya bisa diulang.
+
+    Return (path, runs): path terbaik (run solved dengan path terpendek)
+    atau None kalau tidak ada run yang sampai goal, dan list dict hasil
+    tiap run (_anneal_run) sesuai urutan seed. `stats` dinaikkan selama
+    run berjalan; run di proses lain tidak bisa menyentuhnya, jadi
+    counter-nya ditambahkan per run begitu hasilnya masuk.
+    """
+    state = as_compact(initial_state)
+    if seed is None:
+        seed = random.randrange(1 << 30)
+    seeds = [seed + k for k in range(restarts)]
+    args = (max_iter, start_temp, cooling_rate)
+    if workers > 1 and restarts > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, restarts)) as pool:
+            runs = []
+            for run in pool.map(_anneal_run, itertools.repeat(state), seeds,
+                                *(itertools.repeat(a) for a in args)):
+                if stats is not None:
+                    stats.expanded += run['iterations']
+                    stats.generated += run['sampled']
+                runs.append(run)
+    else:
+        runs = [_anneal_run(state, s, *args, stats) for s in seeds]
 
-        temp *= cooling_rate
+    solved = [run for run in runs if run['solved']]
+    if not solved:
+        return None, runs
+    return min(solved, key=lambda run: len(run['path']))['path'], runs
 
+def simulated_annealing_solver(initial_state, max_iter=5000, start_temp=500, cooling_rate=0.995,
+                               restarts=1, workers=1, seed=None, stats=None):
+    """
+    anneal() dengan antarmuka SOLVERS: return path terbaik atau None.
+    `stats` diisi total semua run: expanded = iterasi, generated = langkah
+    legal yang diambil sampelnya.
+    """
+    path, runs = anneal(initial_state, restarts, workers, seed,
+                        max_iter, start_temp, cooling_rate, stats)
 
-    if best.is_goal():
-        print("Best solution found.")
-        return best_path
+    solved = sum(run['solved'] for run in runs)
+    if path is not None:
+        print(f"Best solution found ({solved}/{len(runs)} run sampai goal).")
     else:
-        # print(f"Si kocak udah ngulang sebanyak:{percobaan}")
-        # simulated_annealing_solver(initial_state, max_iter=5000, start_temp=500, cooling_rate=0.995, percobaan=(percobaan+1))
-        print("No solution found within max iterations.")
+        print(f"No solution found within max iterations ({len(runs)} run).")
+    return path
+
+
+# nama -> solver(state, stats=None) yang mengembalikan [(car_id, delta), …] atau None
+SOLVERS = {
+    'bfs': bfs,
+    'ac3_bfs': ac3_bfs,
+    'bidirectional_bfs': bidirectional_bfs,
+    'a_star': a_star_moves,
+    'ida_star': ida_star,
+    'ac3_dfs': ac3_dfs,
+    'ac3_mac': functools.partial(ac3_dfs, mac=True),
+    'bfs_macro': functools.partial(bfs, moves='macro'),
+    'bfs_parallel': parallel_bfs,
+    'a_star_macro': functools.partial(a_star_moves, heuristic='vehicle_moves', moves='macro'),
+    'anytime_a_star': anytime_a_star,
+    'beam': beam_search,
+    'iddfs': iddfs,
+    'simulated_annealing': simulated_annealing_solver,
+}
+
+# solver di SOLVERS yang menerima on_solution(path, bound) untuk hasil sementara
+ANYTIME_SOLVERS = ('anytime_a_star',)
+
+try:
+    from rushhour_vector import bfs_vectorized
+except ModuleNotFoundError as e:
+    if e.name != 'numpy':
+        raise
+else:
+    SOLVERS['bfs_numpy'] = bfs_vectorized
@@ -1,5 +1,17 @@
 import csv
 
+# sisi keluar mobil 'sh' per orientasinya; yang pertama = default
+EXITS = {'h': ('right', 'left'), 'v': ('bottom', 'top')}
+
+
+def dimensions(grid_size):
+    """(rows, cols) dari grid_size: int untuk papan persegi atau (rows, cols)."""
+    if isinstance(grid_size, int):
+        return grid_size, grid_size
+    rows, cols = grid_size
+    return rows, cols
+
+
 class Car:
     def __init__(self, cid, orientation, length, row, col):
         self.id = cid
@@ -17,31 +29,89 @@ class Car:
         ]
 
 class RushHourState:
-    def __init__(self, cars, grid_size=6):
+    """
+    grid_size: int (papan persegi) atau (rows, cols). exit: sisi keluar
+    mobil 'sh' ('right'/'left' kalau horizontal, 'bottom'/'top' kalau
+    vertikal); None = sisi default di EXITS.
+    """
+    def __init__(self, cars, grid_size=6, exit=None):
         self.cars = cars 
         self.grid_size = grid_size
+        self.rows, self.cols = dimensions(grid_size)
+        sides = EXITS[cars['sh'].orientation]
+        if exit is None:
+            exit = sides[0]
+        if exit not in sides:
+            raise ValueError(f"exit {exit!r} tidak cocok untuk mobil 'sh' "
+                             f"{cars['sh'].orientation!r}, pilih {sides}")
+        self.exit = exit
+        self._grid = None
 
     @staticmethod
-    def from_csv(path):
+    def from_csv(path, compact=False):
+        """
+        Baris: orientasi,panjang,row,col dengan orientasi h/v/b, 'sh' (mobil
+        merah horizontal) atau 'sv' (mobil merah vertikal). Baris opsional
+        'grid,rows,cols' dan 'exit,sisi' mengubah ukuran papan (default 6x6)
+        dan sisi keluar.
+        """
         cars = {}
+        grid_size, exit = 6, None
         id_counter = {'h': 0, 'v': 0, 'b': 0}
         with open(path) as f:
             reader = csv.reader(f)
             for row in reader:
+                if not row:
+                    continue
+                if row[0] == 'grid':
+                    grid_size = (int(row[1]), int(row[2]))
+                    continue
+                if row[0] == 'exit':
+                    exit = row[1]
+                    continue
                 ori, length, r, c = row[0], int(row[1]), int(row[2]), int(row[3])
-                if ori == 'sh':
+                if ori in ('sh', 'sv'):
                     id = 'sh'
-                    ori = 'h'
+                    ori = ori[1]
                 else:
                     id_counter[ori] += 1
                     id = ori + str(id_counter[ori])
                 cars[id] = Car(id, ori, length, r, c)
-        return RushHourState(cars)
+        state = RushHourState(cars, grid_size, exit)
+        return state.to_compact() if compact else state
+
+    def to_csv(self, path):
+        """Tulis dalam format from_csv (baris grid/exit hanya kalau bukan default)."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            if (self.rows, self.cols) != (6, 6):
+                writer.writerow(['grid', self.rows, self.cols])
+            if self.exit != EXITS[self.cars['sh'].orientation][0]:
+                writer.writerow(['exit', self.exit])
+            for car in self.cars.values():
+                ori = 's' + car.orientation if car.id == 'sh' else car.orientation
+                writer.writerow([ori, car.length, car.row, car.col])
+
+    def to_compact(self):
+        """Return the equivalent CompactState (bitboard + head tuple)."""
+        board = Board(self.cars.values(), self.grid_size, self.exit)
+        heads = tuple(car.row if car.orientation == 'v' else car.col
+                      for car in self.cars.values())
+        return CompactState(board, heads)
+
+    def exit_head(self):
+        """Koordinat head mobil 'sh' (di jalurnya) saat sudah keluar."""
+        sh = self.cars['sh']
+        if self.exit == 'right':
+            return self.cols - sh.length
+        if self.exit == 'bottom':
+            return self.rows - sh.length
+        return 0
 
     def is_goal(self):
-        """Goal: special car 'sh' reaches right edge"""
+        """Goal: special car 'sh' reaches the exit edge"""
         sh = self.cars['sh']
-        return sh.col + sh.length == self.grid_size
+        return (sh.row if sh.orientation == 'v' else sh.col) == self.exit_head()
 
     def occupied(self):
         """Return set of all occupied positions"""
@@ -49,6 +119,28 @@ class RushHourState:
         for car in self.cars.values():
             occ.update(car.positions())
         return occ
+
+    def grid(self):
+        """
+        Occupancy grid: grid[r][c] is the id of the car on that cell or None.
+        Built on first use, then kept current by place_car (move_car).
+        """
+        if self._grid is None:
+            self._grid = [[None] * self.cols for _ in range(self.rows)]
+            for car in self.cars.values():
+                for r, c in car.positions():
+                    self._grid[r][c] = car.id
+        return self._grid
+
+    def place_car(self, car, row, col):
+        """Move `car` to head (row, col), updating the grid in O(length)."""
+        grid = self.grid()
+        for r, c in car.positions():
+            grid[r][c] = None
+        car.row, car.col = row, col
+        for r, c in car.positions():
+            grid[r][c] = car.id
+
     def __eq__(self, other):
         if not isinstance(other, RushHourState):
             return False
@@ -60,3 +152,203 @@ class RushHourState:
 
     def __hash__(self):
         return hash(tuple((c.id, c.row, c.col) for c in self.cars.values()))
+
+
+class Board:
+    """
+    Static car metadata shared by every CompactState of one puzzle.
+
+    Car i moves along a fixed line (its row for 'h'/'b', its column for
+    'v'); only the head coordinate along that line changes between states.
+    masks[i][p] is the occupancy bitmask of car i with its head at p, where
+    cell (r, c) is bit r * cols + c. `cache` holds tables derived from
+    the board (heuristics etc.), built lazily by whoever needs them.
+
+    The board is rows x cols (grid_size as in RushHourState). `goal` is the
+    red car's head coordinate once it is out through `exit`, and
+    exit_mask(head) the cells between the red car and that exit.
+
+    pack() turns a heads tuple into one integer, `bits` bits per car with
+    car 0 in the lowest bits; that integer is the search key of a state.
+    `groups` lists interchangeable cars (same orientation, length and
+    line, red car excluded) for symmetric_key().
+    """
+    __slots__ = ('grid_size', 'rows', 'cols', 'exit', 'goal', 'ids', 'orientations',
+                 'lengths', 'lines', 'movable', 'index', 'red', 'masks', 'cache',
+                 'bits', 'groups')
+
+    def __init__(self, cars, grid_size=6, exit=None):
+        cars = list(cars)
+        self.grid_size = grid_size
+        self.rows, self.cols = dimensions(grid_size)
+        self.ids = tuple(car.id for car in cars)
+        self.orientations = tuple(car.orientation for car in cars)
+        self.lengths = tuple(car.length for car in cars)
+        self.lines = tuple(car.col if car.orientation == 'v' else car.row
+                           for car in cars)
+        self.movable = tuple(car.orientation in ('h', 'v') for car in cars)
+        self.index = {cid: i for i, cid in enumerate(self.ids)}
+        self.red = self.index['sh']
+        self.masks = tuple(
+            tuple(self.cells_mask(i, p)
+                  for p in range(self.span(i) - self.lengths[i] + 1))
+            for i in range(len(cars))
+        )
+        self.exit = exit or EXITS[self.orientations[self.red]][0]
+        self.goal = 0 if self.exit in ('left', 'top') else \
+            len(self.masks[self.red]) - 1
+        self.cache = {}
+        self.bits = max(1, (max(self.rows, self.cols) - 1).bit_length())
+        groups = {}
+        for i in range(len(cars)):
+            if self.movable[i] and i != self.red:
+                groups.setdefault((self.orientations[i], self.lengths[i], self.lines[i]),
+                                  []).append(i)
+        self.groups = tuple(tuple(g) for g in groups.values() if len(g) > 1)
+
+    def span(self, i):
+        """Number of cells on car i's line."""
+        return self.rows if self.orientations[i] == 'v' else self.cols
+
+    def exit_mask(self, head):
+        """Cells on the red car's line between it (head at `head`) and the exit."""
+        red = self.red
+        if self.exit in ('right', 'bottom'):
+            cells = range(head + self.lengths[red], self.span(red))
+        else:
+            cells = range(0, head)
+        mask = 0
+        for p in cells:
+            r, c = self.cell(red, p)
+            mask |= 1 << (r * self.cols + c)
+        return mask
+
+    def cell(self, i, p):
+        """(row, col) of the cell at coordinate p on car i's line."""
+        if self.orientations[i] == 'v':
+            return (p, self.lines[i])
+        return (self.lines[i], p)
+
+    def cells_mask(self, i, head):
+        mask = 0
+        for k in range(self.lengths[i]):
+            r, c = self.cell(i, head + k)
+            mask |= 1 << (r * self.cols + c)
+        return mask
+
+    def occupancy(self, heads):
+        occ = 0
+        for i, p in enumerate(heads):
+            occ |= self.masks[i][p]
+        return occ
+
+    def pack(self, heads):
+        key = 0
+        for head in reversed(heads):
+            key = (key << self.bits) | head
+        return key
+
+    def unpack(self, key):
+        mask = (1 << self.bits) - 1
+        return tuple((key >> (self.bits * i)) & mask for i in range(len(self.ids)))
+
+    def symmetric_key(self, heads):
+        """
+        pack() with the heads of each group of interchangeable cars sorted,
+        so states that only swap identical cars share one key. Cars of a
+        group share a line and can never pass each other, so inside one
+        connected component this merges nothing (see `rushhour_benchmark.py
+        keys`); the searches therefore use the plain code.
+        """
+        if not self.groups:
+            return self.pack(heads)
+        heads = list(heads)
+        for group in self.groups:
+            for i, p in zip(group, sorted(heads[i] for i in group)):
+                heads[i] = p
+        return self.pack(heads)
+
+
+class CompactState:
+    """
+    Immutable search state: a tuple of head coordinates plus the
+    rows*cols-bit occupancy mask, with the car metadata kept once in a shared Board.
+    `code` is board.pack(heads), updated in O(1) by slide(); key() returns
+    it for visited sets and parent tables. `move` is the (car_id, delta)
+    that produced the state, if any.
+    """
+    __slots__ = ('board', 'heads', 'occ', 'code', 'move')
+
+    def __init__(self, board, heads, occ=None, move=None, code=None):
+        self.board = board
+        self.heads = heads
+        self.occ = board.occupancy(heads) if occ is None else occ
+        self.code = board.pack(heads) if code is None else code
+        self.move = move
+
+    @property
+    def grid_size(self):
+        return self.board.grid_size
+
+    def key(self):
+        return self.code
+
+    def head(self, cid):
+        """(row, col) of the head of car `cid`."""
+        i = self.board.index[cid]
+        return self.board.cell(i, self.heads[i])
+
+    def is_goal(self):
+        board = self.board
+        return self.heads[board.red] == board.goal
+
+    def slide(self, i, delta):
+        """
+        Return the state after sliding car i by delta cells, or None if the
+        slide is illegal. Every cell passed on the way must be free, so a
+        macro move (|delta| > 1) cannot jump over another car.
+        """
+        board = self.board
+        p = self.heads[i]
+        q = p + delta
+        masks = board.masks[i]
+        if not board.movable[i] or q < 0 or q >= len(masks):
+            return None
+        rest = self.occ ^ masks[p]
+        if rest & masks[q]:
+            return None
+        if delta > 1 or delta < -1:
+            step = 1 if delta > 0 else -1
+            for h in range(p + step, q, step):
+                if rest & masks[h]:
+                    return None
+        heads = self.heads[:i] + (q,) + self.heads[i + 1:]
+        return CompactState(board, heads, rest | masks[q],
+                            (board.ids[i], delta), self.code + (delta << board.bits * i))
+
+    def neighbors(self):
+        """List of (next_state, (car_id, delta)) for every legal unit slide."""
+        result = []
+        for i in range(len(self.heads)):
+            for delta in (-1, 1):
+                nxt = self.slide(i, delta)
+                if nxt is not None:
+                    result.append((nxt, nxt.move))
+        return result
+
+    def to_state(self):
+        """Convert back to a mutable RushHourState (e.g. for the GUI)."""
+        board = self.board
+        cars = {}
+        for i, cid in enumerate(board.ids):
+            r, c = board.cell(i, self.heads[i])
+            cars[cid] = Car(cid, board.orientations[i], board.lengths[i], r, c)
+        return RushHourState(cars, board.grid_size, board.exit)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactState):
+            return False
+        return self.code == other.code
+
+    def __hash__(self):
+        return hash(self.code)
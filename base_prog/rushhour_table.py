@@ -0,0 +1,165 @@
+"""
+Tabel jarak-ke-goal untuk seluruh state yang terjangkau dari satu puzzle.
+
+Satu BFS mengenumerasi komponen terhubung state awal, BFS mundur dari semua
+state goal di komponen itu memberi jarak eksak tiap state. Hasilnya disimpan
+ke file sebagai array key (Board.pack: head tiap mobil dalam satu integer
+64-bit, terurut) + array jarak 1 byte, sehingga "langkah optimal
+berikutnya" dari state mana pun cukup dijawab dengan lookup, tanpa search.
+
+    python rushhour_table.py build dataaset/game0.csv game0.rhdt
+    python rushhour_table.py solve dataaset/game0.csv game0.rhdt
+"""
+import argparse
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from rushhour_state import RushHourState, Car
+from rushhour_search import as_compact
+
+MAGIC = b'RHDT'
+VERSION = 1
+UNSOLVABLE = 255
+
+
+class DistanceTable:
+
+    def __init__(self, root, keys, distances):
+        self.root = as_compact(root)
+        self.keys = keys
+        self.distances = distances
+        board = self.root.board
+        if board.bits * len(board.ids) > 64:
+            raise ValueError("board terlalu besar untuk key 64-bit")
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, state):
+        """Enumerasi komponen `state` dan hitung jarak eksak ke goal."""
+        root = as_compact(state)
+        component = {root.key(): root}
+        layer = [root]
+        while layer:
+            next_layer = []
+            for st in layer:
+                for nxt, _ in st.neighbors():
+                    if nxt.key() not in component:
+                        component[nxt.key()] = nxt
+                        next_layer.append(nxt)
+            layer = next_layer
+
+        dist = {key: 0 for key, st in component.items() if st.is_goal()}
+        layer = [component[key] for key in dist]
+        depth = 0
+        while layer:
+            depth += 1
+            if depth >= UNSOLVABLE:
+                raise ValueError("jarak ke goal melebihi 254 langkah")
+            next_layer = []
+            for st in layer:
+                for nxt, _ in st.neighbors():
+                    if nxt.key() not in dist:
+                        dist[nxt.key()] = depth
+                        next_layer.append(nxt)
+            layer = next_layer
+
+        table = cls(root, array('Q'), array('B'))
+        entries = sorted((key, dist.get(key, UNSOLVABLE)) for key in component)
+        table.keys.extend(key for key, _ in entries)
+        table.distances.extend(d for _, d in entries)
+        return table
+
+    def distance(self, state):
+        """Jarak optimal ke goal, atau None (di luar komponen / buntu)."""
+        key = as_compact(state).key()
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        d = self.distances[i]
+        return None if d == UNSOLVABLE else d
+
+    def next_move(self, state):
+        """(car_id, delta) yang mengurangi jarak ke goal, atau None."""
+        state = as_compact(state)
+        d = self.distance(state)
+        if not d:
+            return None
+        for nxt, move_info in state.neighbors():
+            if self.distance(nxt) == d - 1:
+                return move_info
+        return None
+
+    def solve(self, state):
+        """Path optimal lengkap dengan mengikuti next_move; None kalau buntu."""
+        state = as_compact(state)
+        if self.distance(state) is None:
+            return None
+        path = []
+        while not state.is_goal():
+            cid, delta = self.next_move(state)
+            state = state.slide(state.board.index[cid], delta)
+            path.append((cid, delta))
+        return path
+
+    def save(self, path):
+        board = self.root.board
+        header = json.dumps({
+            'grid_size': board.grid_size,
+            'exit': board.exit,
+            'cars': [[cid, ori, length, *board.cell(i, head)]
+                     for i, (cid, ori, length, head)
+                     in enumerate(zip(board.ids, board.orientations,
+                                      board.lengths, self.root.heads))],
+        }).encode()
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<HII', VERSION, len(header), len(self.keys)))
+            f.write(header)
+            self.keys.tofile(f)
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.read(4) != MAGIC:
+                raise ValueError(f"{path} bukan tabel jarak Rush Hour")
+            version, header_len, count = struct.unpack('<HII', f.read(10))
+            if version != VERSION:
+                raise ValueError(f"versi tabel {version} tidak didukung")
+            header = json.loads(f.read(header_len))
+            keys, distances = array('Q'), array('B')
+            keys.fromfile(f, count)
+            distances.fromfile(f, count)
+        cars = {cid: Car(cid, ori, length, r, c) for cid, ori, length, r, c in header['cars']}
+        grid_size = header['grid_size']
+        if isinstance(grid_size, list):
+            grid_size = tuple(grid_size)
+        root = RushHourState(cars, grid_size, header.get('exit'))
+        return cls(root, keys, distances)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['build', 'solve'])
+    parser.add_argument('csv')
+    parser.add_argument('table')
+    args = parser.parse_args()
+
+    state = RushHourState.from_csv(args.csv)
+    if args.command == 'build':
+        table = DistanceTable.build(state)
+        table.save(args.table)
+        print(f"{len(table)} state, jarak awal {table.distance(state)} -> {args.table}")
+    else:
+        table = DistanceTable.load(args.table)
+        path = table.solve(state)
+        if path is None:
+            sys.exit("state tidak ada di tabel atau tidak bisa diselesaikan")
+        print(f"Langkah: {len(path)}")
+        print(path)
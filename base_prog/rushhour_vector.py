@@ -0,0 +1,125 @@
+"""
+BFS layer-synchronous yang di-vektorisasi dengan NumPy (opsional: modul
+ini hanya di-import kalau numpy terpasang; rushhour_search mendaftarkan
+'bfs_numpy' di SOLVERS kalau import-nya berhasil).
+
+Satu layer frontier = array uint64 berisi key Board.pack. Untuk seluruh
+layer sekaligus: head tiap mobil di-decode dengan shift/mask, okupansi
+dibangun dari tabel mask per (mobil, head) sebagai matriks mobil x state,
+lalu tiap arah menghasilkan semua geser legal semua mobil dengan beberapa
+operasi array. Duplikat dibuang
+dengan np.unique, lalu dicocokkan ke layer sebelumnya dan layer sekarang
+saja: langkah Rush Hour reversible, jadi tetangga state di layer d hanya
+bisa berada di layer d - 1, d, atau d + 1.
+
+Syarat: key muat di 64 bit (bits * jumlah mobil <= 64) dan papan paling
+banyak 64 sel; selain itu ValueError (pakai bfs biasa).
+"""
+import numpy as np
+
+from rushhour_state import CompactState
+
+
+def _tables(board):
+    """
+    Tabel konstan per board: mask per (mobil, head) sebagai array uint64
+    (baris dipad 0), jumlah head, flag movable, dan shift key tiap mobil.
+    """
+    count = np.array([len(m) for m in board.masks], dtype=np.int64)
+    masks = np.zeros((len(board.masks), int(count.max())), dtype=np.uint64)
+    for i, row in enumerate(board.masks):
+        masks[i, :len(row)] = row
+    movable = np.array(board.movable, dtype=bool)
+    shifts = np.arange(len(board.ids), dtype=np.uint64) * np.uint64(board.bits)
+    return masks, count, movable, shifts
+
+
+def expand_layer(board, codes, tables=None):
+    """
+    Semua geser satu sel dari setiap state di `codes` (uint64), semua mobil
+    dan state sekaligus sebagai matriks (mobil x state). Return (children,
+    parent_index, move) dengan move = 2 * mobil + (delta > 0); belum
+    dideduplikasi.
+    """
+    masks, count, movable, shifts = tables or _tables(board)
+    cars = np.arange(len(count))[:, None]
+    field = np.uint64((1 << board.bits) - 1)
+    heads = ((codes[None, :] >> shifts[:, None]) & field).astype(np.int64)
+    own = masks[cars, heads]
+    rest = np.bitwise_or.reduce(own, axis=0)[None, :] ^ own
+    steps = np.uint64(1) << shifts
+
+    children, parents, moves = [], [], []
+    for delta in (-1, 1):
+        q = heads + delta
+        legal = movable[:, None] & (q >= 0) & (q < count[:, None])
+        car, idx = np.nonzero(legal)
+        ok = (rest[car, idx] & masks[car, q[car, idx]]) == 0
+        car, idx = car[ok], idx[ok]
+        children.append(codes[idx] - steps[car] if delta < 0 else codes[idx] + steps[car])
+        parents.append(idx)
+        moves.append((2 * car + (delta > 0)).astype(np.uint8))
+    return np.concatenate(children), np.concatenate(parents), np.concatenate(moves)
+
+
+def _member(sorted_codes, codes):
+    """Mask boolean: elemen `codes` yang ada di array terurut `sorted_codes`."""
+    if not len(sorted_codes):
+        return np.zeros(len(codes), dtype=bool)
+    pos = np.searchsorted(sorted_codes, codes)
+    pos[pos == len(sorted_codes)] = 0
+    return sorted_codes[pos] == codes
+
+
+def bfs_vectorized(initial_state, stats=None):
+    """
+    BFS optimal (langkah satu sel) yang mengekspansi satu layer penuh per
+    iterasi. Per layer disimpan array key terurut + key parent + langkah,
+    dan path direkonstruksi mundur dengan searchsorted. Return path
+    [(car_id, delta), …] atau None.
+    """
+    # bukan as_compact: rushhour_search meng-import modul ini
+    start = initial_state if isinstance(initial_state, CompactState) \
+        else initial_state.to_compact()
+    board = start.board
+    if board.bits * len(board.ids) > 64 or board.rows * board.cols > 64:
+        raise ValueError("board terlalu besar untuk key/okupansi 64-bit")
+    if start.is_goal():
+        return []
+    tables = _tables(board)
+    red_shift = np.uint64(board.bits * board.red)
+    field = np.uint64((1 << board.bits) - 1)
+
+    layer = np.array([start.key()], dtype=np.uint64)
+    previous = np.empty(0, dtype=np.uint64)
+    history = []        # per layer d >= 1: (key terurut, key parent, move)
+
+    while len(layer):
+        children, parent_index, moves = expand_layer(board, layer, tables)
+        codes, first = np.unique(children, return_index=True)
+        fresh = ~(_member(layer, codes) | _member(previous, codes))
+        codes, first = codes[fresh], first[fresh]
+        history.append((codes, layer[parent_index[first]], moves[first]))
+        if stats is not None:
+            stats.depth = len(history) - 1
+            stats.expanded += len(layer)
+            stats.generated += len(children)
+            stats.duplicates += len(children) - len(codes)
+            stats.frontier_peak = max(stats.frontier_peak, len(codes))
+
+        goals = np.flatnonzero(((codes >> red_shift) & field) == board.goal)
+        if len(goals):
+            return _reconstruct(board, history, codes[goals[0]])
+        previous, layer = layer, codes
+    return None
+
+
+def _reconstruct(board, history, code):
+    path = []
+    for codes, parent_codes, moves in reversed(history):
+        k = np.searchsorted(codes, code)
+        move = int(moves[k])
+        path.append((board.ids[move >> 1], 1 if move & 1 else -1))
+        code = parent_codes[k]
+    path.reverse()
+    return path